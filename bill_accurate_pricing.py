@@ -4,6 +4,7 @@ Bill-accurate pricing processor using real tariff data extracted from bills.
 """
 
 import json
+import numpy as np
 import pandas as pd
 from datetime import datetime, time
 from typing import Dict, List, Optional
@@ -32,6 +33,11 @@ class BillAccuratePricingProcessor:
         except Exception as e:
             print(f"❌ Error loading tariff configuration: {e}")
             self.tariff_periods = []
+        
+        # Sorted period boundaries for vectorized lookups (periods do not overlap)
+        self._period_order = np.argsort([p['start_date'] for p in self.tariff_periods], kind='stable')
+        self._period_starts = np.array([self.tariff_periods[i]['start_date'] for i in self._period_order], dtype=str)
+        self._period_ends = np.array([self.tariff_periods[i]['end_date'] for i in self._period_order], dtype=str)
     
     def find_tariff_period(self, timestamp: datetime) -> Optional[Dict]:
         """Find the appropriate tariff period for a given timestamp."""
@@ -43,6 +49,20 @@ class BillAccuratePricingProcessor:
         
         return None
     
+    def find_tariff_period_indices(self, dates: pd.DatetimeIndex) -> np.ndarray:
+        """Find the index into tariff_periods for many dates at once (-1 where none applies)."""
+        date_strs = np.asarray(dates.strftime('%Y-%m-%d'), dtype=str)
+        indices = np.full(len(date_strs), -1)
+        if not self.tariff_periods or len(date_strs) == 0:
+            return indices
+        
+        # Latest period starting on or before each date, if it has not ended yet
+        pos = np.searchsorted(self._period_starts, date_strs, side='right') - 1
+        found = pos >= 0
+        found[found] = self._period_ends[pos[found]] >= date_strs[found]
+        indices[found] = self._period_order[pos[found]]
+        return indices
+    
     def get_time_of_use_rate(self, timestamp: datetime, period: Dict) -> float:
         """Get the appropriate rate for time-of-use tariff."""
         # Convert to UK timezone if needed
@@ -72,21 +92,56 @@ class BillAccuratePricingProcessor:
         # Fallback to first rate if no match
         return period['time_of_use_rates'][0]['rate_pence_per_kwh']
     
+    def get_time_of_use_rates(self, timestamps: pd.DatetimeIndex, period: Dict) -> np.ndarray:
+        """Get time-of-use rates for many timestamps at once (same rules as get_time_of_use_rate)."""
+        # Naive timestamps are already UK wall-clock time; aware ones are converted in one go
+        if timestamps.tz is not None:
+            timestamps = timestamps.tz_convert('Europe/London')
+        
+        time_ns = (((timestamps.hour.to_numpy(np.int64) * 60 + timestamps.minute.to_numpy(np.int64)) * 60
+                    + timestamps.second.to_numpy(np.int64)) * 10**9
+                   + timestamps.microsecond.to_numpy(np.int64) * 1000 + timestamps.nanosecond.to_numpy(np.int64))
+        
+        tou_rates = period['time_of_use_rates']
+        rates = np.full(len(time_ns), tou_rates[0]['rate_pence_per_kwh'], dtype=float)
+        unmatched = np.ones(len(time_ns), dtype=bool)
+        
+        # Earlier rates take precedence, so only fill timestamps not matched yet
+        for rate in tou_rates:
+            start_time = datetime.strptime(rate['start_time'], '%H:%M')
+            end_time = datetime.strptime(rate['end_time'], '%H:%M')
+            start_ns = (start_time.hour * 60 + start_time.minute) * 60 * 10**9
+            end_ns = (end_time.hour * 60 + end_time.minute) * 60 * 10**9
+            
+            if start_ns <= end_ns:
+                in_range = (time_ns >= start_ns) & (time_ns < end_ns)
+            else:
+                in_range = (time_ns >= start_ns) | (time_ns < end_ns)
+            
+            hit = in_range & unmatched
+            rates[hit] = rate['rate_pence_per_kwh']
+            unmatched &= ~hit
+        
+        return rates
+    
     def process_consumption_data(self, consumption_data: pd.DataFrame) -> pd.DataFrame:
         """Add accurate pricing to consumption data."""
         
         # Create a copy to avoid modifying original
         data = consumption_data.copy()
         
-        # Add pricing columns
-        data['rate_pence_per_kwh'] = 0.0
-        data['cost_pence'] = 0.0
-        data['tariff_period'] = ''
-        data['rate_type'] = ''
-        data['tariff_code'] = ''
+        # Gather pricing into arrays and assign each column once after the loop
+        n = len(data)
+        rates = np.zeros(n)
+        costs = np.zeros(n)
+        tariff_periods = [''] * n
+        rate_types = [''] * n
+        tariff_codes = [''] * n
         
-        for timestamp, row in data.iterrows():
-            consumption_kwh = row['consumption']
+        consumption_pos = data.columns.get_loc('consumption') + 1
+        for pos, row in enumerate(data.itertuples(index=True, name=None)):
+            timestamp = row[0]
+            consumption_kwh = row[consumption_pos]
             
             # Find tariff period
             tariff_period = self.find_tariff_period(timestamp)
@@ -103,14 +158,17 @@ class BillAccuratePricingProcessor:
                 rate_type = f"Fixed ({tariff_period['tariff_code']})"
             
             # Calculate cost
-            cost_pence = consumption_kwh * rate
-            
-            # Update data
-            data.loc[timestamp, 'rate_pence_per_kwh'] = rate
-            data.loc[timestamp, 'cost_pence'] = cost_pence
-            data.loc[timestamp, 'tariff_period'] = f"{tariff_period['start_date']} to {tariff_period['end_date']}"
-            data.loc[timestamp, 'rate_type'] = rate_type
-            data.loc[timestamp, 'tariff_code'] = tariff_period['tariff_code']
+            rates[pos] = rate
+            costs[pos] = consumption_kwh * rate
+            tariff_periods[pos] = f"{tariff_period['start_date']} to {tariff_period['end_date']}"
+            rate_types[pos] = rate_type
+            tariff_codes[pos] = tariff_period['tariff_code']
+        
+        data['rate_pence_per_kwh'] = rates
+        data['cost_pence'] = costs
+        data['tariff_period'] = tariff_periods
+        data['rate_type'] = rate_types
+        data['tariff_code'] = tariff_codes
         
         return data
     
@@ -155,31 +213,41 @@ class BillAccuratePricingProcessor:
         else:
             date_range = pd.date_range(start=start_date, end=end_date, freq='30min')
         
-        price_data = []
+        # Match every timestamp to its tariff period in one lookup
+        period_idx = self.find_tariff_period_indices(date_range)
+        matched = period_idx >= 0
+        if not matched.any():
+            return pd.DataFrame()
         
-        for timestamp in date_range:
-            tariff_period = self.find_tariff_period(timestamp)
-            
-            if tariff_period is None:
-                continue
+        timestamps = date_range[matched]
+        period_idx = period_idx[matched]
+        rates = np.empty(len(timestamps))
+        tariff_codes = np.empty(len(timestamps), dtype=object)
+        rate_types = np.empty(len(timestamps), dtype=object)
+        standing_charges = np.empty(len(timestamps))
+        
+        # Resolve rates per period so timestamps are converted in bulk, not row by row
+        for i in pd.unique(period_idx):
+            tariff_period = self.tariff_periods[i]
+            in_period = period_idx == i
             
-            # Get rate for this time
             if tariff_period['rate_type'] == 'time_of_use':
-                rate = self.get_time_of_use_rate(timestamp, tariff_period)
-                rate_type = 'time_of_use'
+                rates[in_period] = self.get_time_of_use_rates(timestamps[in_period], tariff_period)
+                rate_types[in_period] = 'time_of_use'
             else:
-                rate = tariff_period['rate_pence_per_kwh']
-                rate_type = 'fixed'
+                rates[in_period] = tariff_period['rate_pence_per_kwh']
+                rate_types[in_period] = 'fixed'
             
-            price_data.append({
-                'timestamp': timestamp,
-                'rate_pence_per_kwh': rate,
-                'tariff_code': tariff_period['tariff_code'],
-                'rate_type': rate_type,
-                'standing_charge': tariff_period['standing_charge_pence_per_day']
-            })
-        
-        return pd.DataFrame(price_data)
+            tariff_codes[in_period] = tariff_period['tariff_code']
+            standing_charges[in_period] = tariff_period['standing_charge_pence_per_day']
+        
+        return pd.DataFrame({
+            'timestamp': timestamps,
+            'rate_pence_per_kwh': rates,
+            'tariff_code': tariff_codes.tolist(),
+            'rate_type': rate_types.tolist(),
+            'standing_charge': standing_charges
+        })
     
     def is_agile_tariff(self, tariff_code: str) -> bool:
         """Check if a tariff code represents an Agile tariff."""
@@ -5,6 +5,7 @@ Provides 100% accurate pricing for the Flexible Octopus tariff periods.
 """
 
 import json
+import numpy as np
 import pandas as pd
 from datetime import datetime, time
 from typing import Dict, List, Optional, Tuple
@@ -45,6 +46,25 @@ class BillAccuratePricingProcessor:
         
         return None
     
+    def get_standing_charges(self, dates: pd.DatetimeIndex, default: float = 50.0) -> np.ndarray:
+        """Look up the daily standing charge (pence) for many dates in one pass."""
+        date_strs = np.asarray(dates.strftime('%Y-%m-%d'), dtype=str)
+        charges = np.full(len(date_strs), default, dtype=float)
+        if not self.tariff_periods or len(date_strs) == 0:
+            return charges
+        
+        periods = sorted(self.tariff_periods, key=lambda p: p['start_date'])
+        starts = np.array([p['start_date'] for p in periods])
+        ends = np.array([p['end_date'] for p in periods])
+        period_charges = np.array([p['standing_charge_pence_per_day'] for p in periods], dtype=float)
+        
+        # Latest period starting on or before each date, if it has not ended yet
+        idx = np.searchsorted(starts, date_strs, side='right') - 1
+        found = idx >= 0
+        found[found] = ends[idx[found]] >= date_strs[found]
+        charges[found] = period_charges[idx[found]]
+        return charges
+    
     def get_time_of_use_rate(self, timestamp: datetime, period: Dict) -> float:
         """Get the appropriate rate for time-of-use tariff."""
         # Convert to UK timezone if needed
@@ -98,10 +118,8 @@ class BillAccuratePricingProcessor:
         total_cost = 0
         total_consumption = 0
         
-        # Process each consumption reading
-        for timestamp, row in period_data.iterrows():
-            consumption_kwh = row['consumption']
-            
+        # Process each consumption reading (zip avoids building a Series per row)
+        for timestamp, consumption_kwh in zip(period_data.index, period_data['consumption'].to_numpy()):
             # Find tariff period for this timestamp
             tariff_period = self.find_tariff_period(timestamp)
             
@@ -164,9 +182,7 @@ class BillAccuratePricingProcessor:
         data['tariff_period'] = ''
         data['rate_type'] = ''
         
-        for timestamp, row in data.iterrows():
-            consumption_kwh = row['consumption']
-            
+        for timestamp, consumption_kwh in zip(data.index, data['consumption'].to_numpy()):
             # Find tariff period
             tariff_period = self.find_tariff_period(timestamp)
             
@@ -205,38 +221,22 @@ class BillAccuratePricingProcessor:
             'rate_pence_per_kwh': 'mean'
         })
         
-        # Add standing charges for each month
-        monthly_summary = []
+        # Add standing charges for all months in one lookup
+        month_ends = monthly_data.index
+        month_starts = month_ends - pd.offsets.MonthBegin(1)
+        days_in_month = np.asarray(month_ends.days_in_month, dtype=int)
+        standing_charge_pence = days_in_month * self.get_standing_charges(month_starts)
+        total_cost_pence = monthly_data['cost_pence'].to_numpy() + standing_charge_pence
         
-        for month_end, row in monthly_data.iterrows():
-            month_start = month_end.replace(day=1)
-            
-            # Calculate days in month
-            if month_end.month == 12:
-                next_month = month_end.replace(year=month_end.year + 1, month=1, day=1)
-            else:
-                next_month = month_end.replace(month=month_end.month + 1, day=1)
-            
-            days_in_month = (next_month - month_start).days
-            
-            # Get standing charge for this period
-            tariff_period = self.find_tariff_period(month_start)
-            standing_charge_per_day = tariff_period['standing_charge_pence_per_day'] if tariff_period else 50.0
-            standing_charge_pence = days_in_month * standing_charge_per_day
-            
-            total_cost_pence = row['cost_pence'] + standing_charge_pence
-            
-            monthly_summary.append({
-                'month': month_end.strftime('%Y-%m'),
-                'consumption_kwh': round(row['consumption'], 3),
-                'energy_cost_pounds': round(row['cost_pence'] / 100, 2),
-                'standing_charge_pounds': round(standing_charge_pence / 100, 2),
-                'total_cost_pounds': round(total_cost_pence / 100, 2),
-                'average_rate_pence_per_kwh': round(row['rate_pence_per_kwh'], 2),
-                'days_in_month': days_in_month
-            })
-        
-        return pd.DataFrame(monthly_summary)
+        return pd.DataFrame({
+            'month': month_ends.strftime('%Y-%m'),
+            'consumption_kwh': monthly_data['consumption'].round(3).to_numpy(),
+            'energy_cost_pounds': (monthly_data['cost_pence'] / 100).round(2).to_numpy(),
+            'standing_charge_pounds': np.round(standing_charge_pence / 100, 2),
+            'total_cost_pounds': np.round(total_cost_pence / 100, 2),
+            'average_rate_pence_per_kwh': monthly_data['rate_pence_per_kwh'].round(2).to_numpy(),
+            'days_in_month': days_in_month
+        })
 
 def main():
     """Test the bill-accurate pricing processor."""
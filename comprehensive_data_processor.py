@@ -244,30 +244,25 @@ class ComprehensiveDataProcessor:
             enriched_df = pd.read_csv(input_file)
             enriched_df['interval_start'] = pd.to_datetime(enriched_df['interval_start'], utc=True)
             
-            # Convert to local timezone for daily grouping
-            enriched_df['date_local'] = enriched_df['interval_start'].dt.tz_convert('Europe/London').dt.date
+            # Convert to local timezone for daily grouping (datetime64 day key, not date objects)
+            local_start = enriched_df['interval_start'].dt.tz_convert('Europe/London').dt.tz_localize(None)
+            enriched_df['date'] = local_start.values.astype('datetime64[D]')
             
             # Group by date and meter type
-            daily_summary = enriched_df.groupby(['date_local', 'meter_type']).agg({
-                'consumption': ['sum', 'count'],
-                'cost_pounds': 'sum',
-                'standing_charge_pounds': 'sum',
-                'total_cost_pounds': 'sum',
-                'rate_pence_per_kwh': ['min', 'max', 'mean'],
-                'tariff_code': 'first',
-                'rate_type': lambda x: ', '.join([str(i) for i in x.unique() if str(i) != 'nan'])
-            }).round(4)
-            
-            # Flatten column names
-            daily_summary.columns = [
-                'total_kwh', 'readings_count',
-                'cost_pounds', 'standing_charge_pounds', 'total_cost_pounds',
-                'min_rate', 'max_rate', 'avg_rate',
-                'tariff_code', 'rate_types'
-            ]
+            daily_summary = enriched_df.groupby(['date', 'meter_type']).agg(
+                total_kwh=('consumption', 'sum'),
+                readings_count=('consumption', 'count'),
+                cost_pounds=('cost_pounds', 'sum'),
+                standing_charge_pounds=('standing_charge_pounds', 'sum'),
+                total_cost_pounds=('total_cost_pounds', 'sum'),
+                min_rate=('rate_pence_per_kwh', 'min'),
+                max_rate=('rate_pence_per_kwh', 'max'),
+                avg_rate=('rate_pence_per_kwh', 'mean'),
+                tariff_code=('tariff_code', 'first'),
+                rate_types=('rate_type', lambda x: ', '.join([str(i) for i in x.unique() if str(i) != 'nan']))
+            ).round(4)
             
             daily_summary.reset_index(inplace=True)
-            daily_summary.rename(columns={'date_local': 'date'}, inplace=True)
             
             # Save daily summary
             daily_summary.to_csv(output_file, index=False)
@@ -3,15 +3,18 @@ Unified Octopus Energy Dashboard
 Combines solar energy tracking and tariff management into a single web interface.
 """
 
-from flask import Flask, render_template, request, jsonify, redirect, url_for, flash
+from flask import Flask, Response, render_template, request, jsonify, redirect, url_for, flash
 import plotly.graph_objs as go
 import plotly.express as px
-import plotly.utils
+import plotly.io as pio
 import pandas as pd
 import numpy as np
 from datetime import datetime, date, timedelta
-import json
+import base64
+import importlib.util
+import logging
 import os
+from functools import lru_cache
 from pathlib import Path
 
 # Tariff tracker imports
@@ -32,8 +35,12 @@ except ImportError:
     print("⚠️  Weather integration not available")
     WEATHER_AVAILABLE = False
 
+# Serialise chart JSON with orjson when it is installed (per call, not as plotly's global default)
+ORJSON_AVAILABLE = importlib.util.find_spec('orjson') is not None
+
 app = Flask(__name__)
 app.secret_key = 'unified-octopus-dashboard-secret-key'
+logger = logging.getLogger(__name__)
 
 # Initialize logging if available
 if TARIFF_AVAILABLE:
@@ -51,6 +58,15 @@ else:
     def get_manager():
         return None
 
+# Meter types as a fixed categorical so import/export filters compare int codes
+METER_TYPES = pd.CategoricalDtype(['import', 'export'])
+
+# Columns the dashboard uses from each consumption CSV
+SOLAR_COLUMNS = {
+    'daily': ['date', 'meter_type', 'total_kwh'],
+    'raw': ['interval_start', 'interval_end', 'consumption', 'meter_type']
+}
+
 # Solar data loading functions
 def load_solar_data():
     """Load consumption data from CSV files"""
@@ -62,21 +78,37 @@ def load_solar_data():
     dataframes = {}
     for key, filename in data_files.items():
         if os.path.exists(filename):
-            df = pd.read_csv(filename)
-            if key == 'daily':
-                df['date'] = pd.to_datetime(df['date'])
-                df = df.sort_values('date').reset_index(drop=True)
-            elif key == 'raw':
-                df['interval_start'] = pd.to_datetime(df['interval_start'])
-                df['interval_end'] = pd.to_datetime(df['interval_end'])
-                df = df.sort_values('interval_start').reset_index(drop=True)
-            dataframes[key] = df
+            # Keyed on modification time so a re-fetched CSV is picked up
+            dataframes[key] = load_solar_file(key, filename, os.path.getmtime(filename))
         else:
-            print(f"Warning: {filename} not found")
+            logger.warning("%s not found", filename)
             dataframes[key] = pd.DataFrame()
     
     return dataframes
 
+@lru_cache(maxsize=4)
+def load_solar_file(key, filename, mtime):
+    """Read and prepare one consumption CSV (cached, do not modify)"""
+    # Only the needed columns are read, parsed straight into their final dtypes
+    df = pd.read_csv(filename, usecols=SOLAR_COLUMNS[key],
+                     dtype={'meter_type': METER_TYPES})
+    if key == 'daily':
+        df['date'] = pd.to_datetime(df['date'])
+        df = df.sort_values('date').reset_index(drop=True)
+    elif key == 'raw':
+        df['interval_start'] = pd.to_datetime(df['interval_start'])
+        df['interval_end'] = pd.to_datetime(df['interval_end'])
+        df = df.sort_values('interval_start').reset_index(drop=True)
+        # Day key used for fast date-range filtering
+        df['interval_day'] = df['interval_start'].values.astype('datetime64[D]')
+    return df
+
+def split_by_meter_type(df):
+    """Split a dataframe into (import, export) frames in a single groupby pass"""
+    groups = dict(list(df.groupby('meter_type', observed=True, sort=False)))
+    empty = df.iloc[0:0]
+    return groups.get('import', empty), groups.get('export', empty)
+
 def calculate_summary_stats(df):
     """Calculate summary statistics for the dashboard"""
     if df.empty:
@@ -89,15 +121,16 @@ def calculate_summary_stats(df):
             'self_sufficiency': 0
         }
     
-    import_data = df[df['meter_type'] == 'import']
-    export_data = df[df['meter_type'] == 'export']
+    # Sums and means for both meter types in a single aggregation pass
+    totals = df.groupby('meter_type', observed=True)['total_kwh'].agg(['sum', 'mean'])
+    totals = totals.reindex(['import', 'export'], fill_value=0)
     
-    total_import = import_data['total_kwh'].sum() if not import_data.empty else 0
-    total_export = export_data['total_kwh'].sum() if not export_data.empty else 0
+    total_import = totals.at['import', 'sum']
+    total_export = totals.at['export', 'sum']
     net_consumption = total_import - total_export
     
-    avg_daily_import = import_data['total_kwh'].mean() if not import_data.empty else 0
-    avg_daily_export = export_data['total_kwh'].mean() if not export_data.empty else 0
+    avg_daily_import = totals.at['import', 'mean']
+    avg_daily_export = totals.at['export', 'mean']
     
     return {
         'total_import': total_import,
@@ -114,35 +147,39 @@ def get_temperature_data(df, use_rolling_avg=False):
         return pd.DataFrame()
     
     try:
-        from weather_integration import WeatherDataAPI
-        
-        start_date = df['date'].min()
-        end_date = df['date'].max()
-        
-        weather_api = WeatherDataAPI()
-        weather_df = weather_api.create_sample_weather_data(start_date, end_date)
-        
-        weather_df['date'] = pd.to_datetime(weather_df['date'])
-        weather_df = weather_df.sort_values('date')
-        
-        if use_rolling_avg:
-            date_range_days = (weather_df['date'].max() - weather_df['date'].min()).days
-            
-            if date_range_days < 90:
-                window = 7
-            elif date_range_days < 365:
-                window = 14
-            else:
-                window = 30
-                
-            weather_df['temperature_avg_rolling'] = weather_df['temperature_avg'].rolling(window=window, center=True).mean()
-            weather_df['sunshine_hours_rolling'] = weather_df['sunshine_hours'].rolling(window=window, center=True).mean()
-        
-        return weather_df
+        # Charts rendering the same date range share one cached weather frame
+        return load_temperature_data(df['date'].min(), df['date'].max(), use_rolling_avg)
     except Exception as e:
-        print(f"Error getting temperature data: {e}")
+        logger.warning("Error getting temperature data: %s", e)
         return pd.DataFrame()
 
+@lru_cache(maxsize=8)
+def load_temperature_data(start_date, end_date, use_rolling_avg=False):
+    """Build the temperature dataframe for a date range (cached, do not modify)"""
+    from weather_integration import WeatherDataAPI
+    
+    weather_api = WeatherDataAPI()
+    weather_df = weather_api.create_sample_weather_data(start_date, end_date)
+    
+    weather_df['date'] = pd.to_datetime(weather_df['date'])
+    weather_df = weather_df.sort_values('date')
+    
+    if use_rolling_avg:
+        date_range_days = (weather_df['date'].max() - weather_df['date'].min()).days
+        
+        if date_range_days < 90:
+            window = 7
+        elif date_range_days < 365:
+            window = 14
+        else:
+            window = 30
+            
+        rolling = centered_rolling_mean(weather_df[['temperature_avg', 'sunshine_hours']].to_numpy(), window)
+        weather_df['temperature_avg_rolling'] = rolling[:, 0]
+        weather_df['sunshine_hours_rolling'] = rolling[:, 1]
+    
+    return weather_df
+
 # Load solar data
 solar_data = load_solar_data()
 daily_df = solar_data['daily']
@@ -159,6 +196,15 @@ colors = {
     'export': '#28a745'   # Green for energy generated
 }
 
+# Line styles for temperature traces, shared by all charts
+temperature_lines = {
+    'daily': dict(color='orange', width=1, dash='dot'),
+    'main': dict(color='orange', width=2)
+}
+
+# Line series longer than this are drawn with WebGL
+WEBGL_MIN_POINTS = 5000
+
 @app.route('/')
 def index():
     """Main unified dashboard page."""
@@ -173,7 +219,7 @@ def index():
             if mgr:
                 tariff_summary = mgr.get_timeline_summary()
         except Exception as e:
-            print(f"Error getting tariff summary: {e}")
+            logger.warning("Error getting tariff summary: %s", e)
             tariff_summary = {}
     
     return render_template('index.html', 
@@ -208,6 +254,80 @@ def solar_dashboard():
                          data_max_date=data_max_date,
                          tariff_available=TARIFF_AVAILABLE)
 
+def chart_to_json(fig):
+    """Serialise a figure to JSON with plain arrays for the frontend
+    
+    Plotly stores numeric arrays base64-encoded, which the page's plotly.js
+    cannot read. Decode them back to numpy arrays and let the JSON engine
+    (orjson when available) write them out as lists directly.
+    """
+    chart = fig.to_plotly_json()
+    data = []
+    for trace in chart['data']:
+        arrays = {
+            key: np.frombuffer(base64.b64decode(trace[key]['bdata']), dtype=trace[key]['dtype'])
+            for key in ('x', 'y', 'z')
+            if isinstance(trace.get(key), dict) and 'bdata' in trace[key]
+        }
+        data.append({**trace, **arrays})
+    return pio.json.to_json_plotly({'data': data, 'layout': chart['layout']},
+                                   engine='orjson' if ORJSON_AVAILABLE else 'json')
+
+def chart_response(chart_json):
+    """JSON response embedding the serialised chart as an object, not a string
+    
+    The body is sent as a sequence of chunks so the (cached, possibly
+    multi-megabyte) chart string is written out as-is instead of being
+    copied into a new concatenated string for every request.
+    """
+    return Response(('{"success":true,"chart":', chart_json, '}'), mimetype='application/json')
+
+@lru_cache(maxsize=32)
+def cached_chart_json(chart_type, start_date, end_date, options):
+    """Serialised chart for a request (solar data is loaded once at startup)"""
+    return chart_to_json(create_solar_chart(chart_type, start_date, end_date, options))
+
+def create_solar_chart(chart_type, start_date, end_date, options):
+    """Build the requested solar chart for a date range and set of options"""
+    # Filter data by date range if provided, parsing each bound only once.
+    # daily_df is sorted by date, so the range is a contiguous slice.
+    filtered_df = daily_df
+    if start_date and end_date:
+        start_day = pd.to_datetime(start_date).to_datetime64()
+        end_day = pd.to_datetime(end_date).to_datetime64()
+    if start_date and end_date and not daily_df.empty:
+        dates = daily_df['date'].values
+        filtered_df = daily_df.iloc[dates.searchsorted(start_day, 'left'):dates.searchsorted(end_day, 'right')]
+        
+        # Check if filtered data is empty due to date range selection
+        if filtered_df.empty:
+            empty_message = f"No data available for selected date range<br>{start_date} to {end_date}"
+            return create_empty_chart(empty_message)
+    
+    # Check if date range is more than 30 days for rolling averages
+    date_range_days = 0
+    if start_date and end_date:
+        date_range_days = int((end_day - start_day) // np.timedelta64(1, 'D'))
+    elif not filtered_df.empty:
+        date_range_days = (filtered_df['date'].max() - filtered_df['date'].min()).days
+    
+    # Generate chart based on type
+    show_temperature = 'show_temperature' in options
+    use_rolling_avg = 'use_rolling_avg' in options and date_range_days > 30
+    
+    if chart_type == 'daily_overview':
+        return create_daily_overview_chart(filtered_df, show_temperature, use_rolling_avg)
+    elif chart_type == 'hourly_analysis' and not raw_df.empty:
+        return create_hourly_analysis_chart(raw_df, start_date, end_date)
+    elif chart_type == 'net_flow':
+        return create_net_flow_chart(filtered_df, show_temperature, use_rolling_avg)
+    elif chart_type == 'energy_balance':
+        return create_energy_balance_chart(filtered_df)
+    elif chart_type == 'consumption_pattern':
+        return create_consumption_pattern_chart(filtered_df, use_rolling_avg)
+    else:
+        return create_empty_chart("No data available")
+
 @app.route('/api/solar-chart', methods=['POST'])
 def api_solar_chart():
     """API endpoint for generating solar charts."""
@@ -218,64 +338,9 @@ def api_solar_chart():
         end_date = data.get('end_date')
         options = data.get('options', [])
         
-        # Filter data by date range if provided
-        filtered_df = daily_df.copy()
-        if start_date and end_date and not daily_df.empty:
-            filtered_df = daily_df[
-                (daily_df['date'] >= start_date) & 
-                (daily_df['date'] <= end_date)
-            ]
-            
-            # Check if filtered data is empty due to date range selection
-            if filtered_df.empty:
-                empty_message = f"No data available for selected date range<br>{start_date} to {end_date}"
-                fig = create_empty_chart(empty_message)
-                chart_json = json.dumps(fig, cls=plotly.utils.PlotlyJSONEncoder)
-                return jsonify({'success': True, 'chart': chart_json})
-        
-        # Check if date range is more than 30 days for rolling averages
-        date_range_days = 0
-        if start_date and end_date:
-            date_range_days = (pd.to_datetime(end_date) - pd.to_datetime(start_date)).days
-        elif not filtered_df.empty:
-            date_range_days = (filtered_df['date'].max() - filtered_df['date'].min()).days
-        
-        # Generate chart based on type
-        show_temperature = 'show_temperature' in options
-        use_rolling_avg = 'use_rolling_avg' in options and date_range_days > 30
-        
-        if chart_type == 'daily_overview':
-            fig = create_daily_overview_chart(filtered_df, show_temperature, use_rolling_avg)
-        elif chart_type == 'hourly_analysis' and not raw_df.empty:
-            fig = create_hourly_analysis_chart(raw_df, start_date, end_date)
-        elif chart_type == 'net_flow':
-            fig = create_net_flow_chart(filtered_df, show_temperature, use_rolling_avg)
-        elif chart_type == 'energy_balance':
-            fig = create_energy_balance_chart(filtered_df)
-        elif chart_type == 'consumption_pattern':
-            fig = create_consumption_pattern_chart(filtered_df, use_rolling_avg)
-        else:
-            fig = create_empty_chart("No data available")
-        
-        # Force Plotly to use regular arrays instead of binary encoding
-        # This prevents frontend compatibility issues with binary data
-        chart_dict = fig.to_dict()
-        
-        # Convert any binary encoded arrays to regular lists
-        for trace in chart_dict.get('data', []):
-            for key in ['x', 'y', 'z']:
-                if key in trace and isinstance(trace[key], dict):
-                    if 'dtype' in trace[key] and 'bdata' in trace[key]:
-                        # Convert binary data back to regular array
-                        import numpy as np
-                        import base64
-                        binary_data = base64.b64decode(trace[key]['bdata'])
-                        dtype = trace[key]['dtype']
-                        array = np.frombuffer(binary_data, dtype=dtype)
-                        trace[key] = array.tolist()  # Convert to regular Python list
-        
-        chart_json = json.dumps(chart_dict, cls=plotly.utils.PlotlyJSONEncoder)
-        return jsonify({'success': True, 'chart': chart_json})
+        # Repeat requests for the same chart are served from the cache
+        chart_json = cached_chart_json(chart_type, start_date, end_date, tuple(sorted(options)))
+        return chart_response(chart_json)
         
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 400
@@ -405,6 +470,32 @@ if TARIFF_AVAILABLE:
         return original_refresh()
 
 # Chart creation functions (from solar dashboard)
+def centered_rolling_mean(values, window):
+    """Centered rolling mean, equivalent to rolling(window, center=True).mean()
+    
+    Accepts a 1-D array or a 2-D array with one series per column, so several
+    equal-length series can be smoothed in a single cumulative-sum pass.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    squeeze = values.ndim == 1
+    if squeeze:
+        values = values[:, np.newaxis]
+    
+    n = values.shape[0]
+    result = np.full(values.shape, np.nan)
+    if 0 < window <= n:
+        nan_mask = np.isnan(values)
+        zeros = np.zeros((1, values.shape[1]))
+        sums = np.vstack([zeros, np.cumsum(np.where(nan_mask, 0.0, values), axis=0)])
+        nans = np.vstack([zeros, np.cumsum(nan_mask, axis=0)])
+        window_sums = sums[window:] - sums[:-window]
+        window_nans = nans[window:] - nans[:-window]
+        # Any missing value inside a window yields NaN, as pandas does
+        offset = window // 2
+        result[offset:offset + n - window + 1] = np.where(window_nans == 0, window_sums / window, np.nan)
+    
+    return result[:, 0] if squeeze else result
+
 def add_rolling_averages(df, window=7):
     """Add rolling averages to the dataframe"""
     df_copy = df.copy()
@@ -412,139 +503,157 @@ def add_rolling_averages(df, window=7):
     
     for meter_type in df_copy['meter_type'].unique():
         mask = df_copy['meter_type'] == meter_type
-        df_copy.loc[mask, 'rolling_avg'] = df_copy.loc[mask, 'total_kwh'].rolling(window=window, center=True).mean()
+        df_copy.loc[mask, 'rolling_avg'] = centered_rolling_mean(df_copy.loc[mask, 'total_kwh'].to_numpy(), window)
     
     return df_copy
 
+def line_trace(x, y, **props):
+    """Build a plain scatter trace dict, switching to WebGL for long series"""
+    props.setdefault('mode', 'lines')
+    trace_type = 'scattergl' if len(x) > WEBGL_MIN_POINTS else 'scatter'
+    return dict(type=trace_type, x=x, y=y, **props)
+
+def create_base_figure(show_temperature=False):
+    """Create a figure, with a secondary y-axis if temperature will be shown"""
+    if show_temperature:
+        from plotly.subplots import make_subplots
+        fig = make_subplots(specs=[[{"secondary_y": True}]])
+        fig.update_layout(template='plotly_white')
+        return fig
+    return go.Figure(layout=dict(template='plotly_white'))
+
+def add_temperature_traces(fig, weather_df, use_rolling_avg, energy_axis_title):
+    """Add temperature traces on the secondary y-axis of a figure"""
+    if weather_df.empty:
+        return
+    
+    if use_rolling_avg and 'temperature_avg_rolling' in weather_df.columns:
+        # Show both original and rolling average temperature
+        traces = [
+            line_trace(
+                weather_df['date'],
+                weather_df['temperature_avg'],
+                name='Temperature (daily)',
+                line=temperature_lines['daily'],
+                opacity=0.4,
+                yaxis='y2',
+                hovertemplate='<b>Temperature (daily)</b><br>Date: %{x}<br>Temp: %{y:.1f}°C<extra></extra>'
+            ),
+            line_trace(
+                weather_df['date'],
+                weather_df['temperature_avg_rolling'],
+                name='Temperature (avg)',
+                line=temperature_lines['main'],
+                yaxis='y2',
+                hovertemplate='<b>Temperature (rolling avg)</b><br>Date: %{x}<br>Temp: %{y:.1f}°C<extra></extra>'
+            )
+        ]
+    else:
+        # Standard temperature line
+        traces = [
+            line_trace(
+                weather_df['date'],
+                weather_df['temperature_avg'],
+                name='Temperature',
+                line=temperature_lines['main'],
+                yaxis='y2',
+                hovertemplate='<b>Temperature</b><br>Date: %{x}<br>Temp: %{y:.1f}°C<extra></extra>'
+            )
+        ]
+    
+    fig.add_traces(traces, secondary_ys=[True] * len(traces))
+    
+    # Set y-axis titles
+    fig.update_yaxes(title_text=energy_axis_title, secondary_y=False)
+    fig.update_yaxes(title_text='Temperature (°C)', secondary_y=True)
+
 def create_daily_overview_chart(df, show_temperature=False, use_rolling_avg=False):
     """Create daily overview chart showing import vs export"""
     if df.empty:
         return create_empty_chart("No daily data available")
     
-    import_data = df[df['meter_type'] == 'import']
-    export_data = df[df['meter_type'] == 'export']
+    import_data, export_data = split_by_meter_type(df)
     
     # Create figure with secondary y-axis if temperature is requested
-    if show_temperature:
-        from plotly.subplots import make_subplots
-        fig = make_subplots(specs=[[{"secondary_y": True}]])
-    else:
-        fig = go.Figure()
+    fig = create_base_figure(show_temperature)
+    
+    # Collect energy traces and add them to the figure in one call
+    traces = []
     
     # Apply rolling averages if requested
     if use_rolling_avg:
         df_with_rolling = add_rolling_averages(df)
-        import_data_rolling = df_with_rolling[df_with_rolling['meter_type'] == 'import']
-        export_data_rolling = df_with_rolling[df_with_rolling['meter_type'] == 'export']
+        import_data_rolling, export_data_rolling = split_by_meter_type(df_with_rolling)
         
         # Add rolling average traces (primary y-axis)
         if not import_data_rolling.empty:
-            fig.add_trace(go.Scatter(
-                x=import_data_rolling['date'],
-                y=import_data_rolling['rolling_avg'],
-                mode='lines',
+            traces.append(line_trace(
+                import_data_rolling['date'],
+                import_data_rolling['rolling_avg'],
                 name='Import (7-day avg)',
                 line=dict(color=colors['import'], width=3),
                 hovertemplate='<b>Import (7-day avg)</b><br>Date: %{x}<br>Energy: %{y:.2f} kWh<extra></extra>'
-            ), secondary_y=False if show_temperature else None)
+            ))
         
         if not export_data_rolling.empty:
-            fig.add_trace(go.Scatter(
-                x=export_data_rolling['date'],
-                y=export_data_rolling['rolling_avg'],
-                mode='lines',
+            traces.append(line_trace(
+                export_data_rolling['date'],
+                export_data_rolling['rolling_avg'],
                 name='Export (7-day avg)',
                 line=dict(color=colors['export'], width=3),
                 hovertemplate='<b>Export (7-day avg)</b><br>Date: %{x}<br>Energy: %{y:.2f} kWh<extra></extra>'
-            ), secondary_y=False if show_temperature else None)
+            ))
         
         # Add original data as lighter traces
         if not import_data.empty:
-            fig.add_trace(go.Scatter(
-                x=import_data['date'],
-                y=import_data['total_kwh'],
-                mode='lines',
+            traces.append(line_trace(
+                import_data['date'],
+                import_data['total_kwh'],
                 name='Grid Import (daily)',
                 line=dict(color=colors['import'], width=1, dash='dot'),
                 opacity=0.4,
                 hovertemplate='<b>Grid Import</b><br>Date: %{x}<br>Energy: %{y:.2f} kWh<extra></extra>'
-            ), secondary_y=False if show_temperature else None)
+            ))
         
         if not export_data.empty:
-            fig.add_trace(go.Scatter(
-                x=export_data['date'],
-                y=export_data['total_kwh'],
-                mode='lines',
+            traces.append(line_trace(
+                export_data['date'],
+                export_data['total_kwh'],
                 name='Solar Export (daily)',
                 line=dict(color=colors['export'], width=1, dash='dot'),
                 opacity=0.4,
                 hovertemplate='<b>Solar Export</b><br>Date: %{x}<br>Energy: %{y:.2f} kWh<extra></extra>'
-            ), secondary_y=False if show_temperature else None)
+            ))
     else:
         # Add regular traces (primary y-axis) - WORKING VERSION FROM SOLAR_DASHBOARD.PY
         if not import_data.empty:
-            fig.add_trace(go.Scatter(
-                x=import_data['date'],
-                y=import_data['total_kwh'],
+            traces.append(line_trace(
+                import_data['date'],
+                import_data['total_kwh'],
                 mode='lines+markers',
                 name='Grid Import',
                 line=dict(color=colors['import'], width=3),
                 marker=dict(size=6),
                 hovertemplate='<b>Grid Import</b><br>Date: %{x}<br>Energy: %{y:.2f} kWh<extra></extra>'
-            ), secondary_y=False if show_temperature else None)
+            ))
         
         if not export_data.empty:
-            fig.add_trace(go.Scatter(
-                x=export_data['date'],
-                y=export_data['total_kwh'],
+            traces.append(line_trace(
+                export_data['date'],
+                export_data['total_kwh'],
                 mode='lines+markers',
                 name='Solar Export',
                 line=dict(color=colors['export'], width=3),
                 marker=dict(size=6),
                 hovertemplate='<b>Solar Export</b><br>Date: %{x}<br>Energy: %{y:.2f} kWh<extra></extra>'
-            ), secondary_y=False if show_temperature else None)
+            ))
+    
+    fig.add_traces(traces, secondary_ys=[False] * len(traces) if show_temperature else None)
     
     # Add temperature trace if requested
     if show_temperature:
         weather_df = get_temperature_data(df, use_rolling_avg)
-        if not weather_df.empty:
-            if use_rolling_avg and 'temperature_avg_rolling' in weather_df.columns:
-                # Show both original and rolling average temperature
-                fig.add_trace(go.Scatter(
-                    x=weather_df['date'],
-                    y=weather_df['temperature_avg'],
-                    mode='lines',
-                    name='Temperature (daily)',
-                    line=dict(color='orange', width=1, dash='dot'),
-                    opacity=0.4,
-                    yaxis='y2',
-                    hovertemplate='<b>Temperature (daily)</b><br>Date: %{x}<br>Temp: %{y:.1f}°C<extra></extra>'
-                ), secondary_y=True)
-                
-                fig.add_trace(go.Scatter(
-                    x=weather_df['date'],
-                    y=weather_df['temperature_avg_rolling'],
-                    mode='lines',
-                    name='Temperature (avg)',
-                    line=dict(color='orange', width=2),
-                    yaxis='y2',
-                    hovertemplate='<b>Temperature (rolling avg)</b><br>Date: %{x}<br>Temp: %{y:.1f}°C<extra></extra>'
-                ), secondary_y=True)
-            else:
-                # Standard temperature line
-                fig.add_trace(go.Scatter(
-                    x=weather_df['date'],
-                    y=weather_df['temperature_avg'],
-                    mode='lines',
-                    name='Temperature',
-                    line=dict(color='orange', width=2),
-                    yaxis='y2',
-                    hovertemplate='<b>Temperature</b><br>Date: %{x}<br>Temp: %{y:.1f}°C<extra></extra>'
-                ), secondary_y=True)
-            
-            # Set y-axis titles
-            fig.update_yaxes(title_text='Energy (kWh)', secondary_y=False)
-            fig.update_yaxes(title_text='Temperature (°C)', secondary_y=True)
+        add_temperature_traces(fig, weather_df, use_rolling_avg, 'Energy (kWh)')
     
     # Update layout - WORKING VERSION FROM SOLAR_DASHBOARD.PY
     title = 'Daily Energy Import vs Export'
@@ -557,7 +666,6 @@ def create_daily_overview_chart(df, show_temperature=False, use_rolling_avg=Fals
         title=title,
         xaxis_title='Date',
         yaxis_title='Energy (kWh)' if not show_temperature else None,
-        template='plotly_white',
         hovermode='x unified',
         legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
     )
@@ -569,49 +677,59 @@ def create_hourly_analysis_chart(df, start_date, end_date):
     if df.empty:
         return create_empty_chart("No hourly data available")
     
-    # Filter by date range if provided - WORKING VERSION FROM SOLAR_DASHBOARD.PY
-    filtered_df = df.copy()
+    # Filter by date range if provided. The raw data is sorted by interval_start,
+    # so the day keys are monotonic and the range is a contiguous slice.
+    interval_start = df['interval_start'].values
+    meter_type = df['meter_type'].values
+    consumption = df['consumption'].values
     if start_date and end_date:
-        filtered_df = df[
-            (df['interval_start'].dt.date >= pd.to_datetime(start_date).date()) &
-            (df['interval_start'].dt.date <= pd.to_datetime(end_date).date())
-        ]
-    
-    # Extract hour and calculate average consumption by hour - FIX PANDAS WARNING
-    filtered_df = filtered_df.copy()  # Create explicit copy to avoid warning
-    filtered_df['hour'] = filtered_df['interval_start'].dt.hour
-    hourly_avg = filtered_df.groupby(['hour', 'meter_type'])['consumption'].mean().reset_index()
-    
-    import_hourly = hourly_avg[hourly_avg['meter_type'] == 'import']
-    export_hourly = hourly_avg[hourly_avg['meter_type'] == 'export']
-    
-    fig = go.Figure()
-    
-    fig.add_trace(go.Bar(
-        x=import_hourly['hour'],
-        y=import_hourly['consumption'],
-        name='Avg Import',
-        marker_color=colors['import'],
-        opacity=0.7
-    ))
-    
-    fig.add_trace(go.Bar(
-        x=export_hourly['hour'],
-        y=export_hourly['consumption'],
-        name='Avg Export',
-        marker_color=colors['export'],
-        opacity=0.7
-    ))
-    
-    fig.update_layout(
-        title='Average Hourly Energy Profile',
-        xaxis_title='Hour of Day',
-        yaxis_title='Average Energy (kWh)',
-        template='plotly_white',
-        barmode='group'
+        if 'interval_day' in df.columns:
+            interval_day = df['interval_day'].values
+        else:
+            interval_day = interval_start.astype('datetime64[D]')
+        rows = slice(
+            interval_day.searchsorted(np.datetime64(pd.to_datetime(start_date).date(), 'D'), 'left'),
+            interval_day.searchsorted(np.datetime64(pd.to_datetime(end_date).date(), 'D'), 'right')
+        )
+        interval_start, meter_type, consumption = interval_start[rows], meter_type[rows], consumption[rows]
+    
+    # Extract hour and calculate average consumption by hour, using only the columns needed
+    hourly_avg = pd.DataFrame({
+        'hour': (interval_start.astype('datetime64[h]').astype('int64') % 24).astype('int8'),
+        'meter_type': meter_type,
+        'consumption': consumption
+    }).groupby(['hour', 'meter_type'], observed=True)['consumption'].mean().reset_index()
+    
+    import_hourly, export_hourly = split_by_meter_type(hourly_avg)
+    
+    # Build the figure from plain dicts in a single constructor call
+    return go.Figure(
+        data=[
+            dict(
+                type='bar',
+                x=import_hourly['hour'],
+                y=import_hourly['consumption'],
+                name='Avg Import',
+                marker=dict(color=colors['import']),
+                opacity=0.7
+            ),
+            dict(
+                type='bar',
+                x=export_hourly['hour'],
+                y=export_hourly['consumption'],
+                name='Avg Export',
+                marker=dict(color=colors['export']),
+                opacity=0.7
+            )
+        ],
+        layout=dict(
+            title='Average Hourly Energy Profile',
+            xaxis_title='Hour of Day',
+            yaxis_title='Average Energy (kWh)',
+            template='plotly_white',
+            barmode='group'
+        )
     )
-    
-    return fig
 
 def create_net_flow_chart(df, show_temperature=False, use_rolling_avg=False):
     """Create net energy flow chart"""
@@ -619,98 +737,55 @@ def create_net_flow_chart(df, show_temperature=False, use_rolling_avg=False):
         return create_empty_chart("No data available for net flow")
     
     # Calculate net flow (import - export) for each date
-    pivot_df = df.pivot_table(
-        index='date', 
-        columns='meter_type', 
-        values='total_kwh', 
-        fill_value=0
-    ).reset_index()
-    
-    if 'import' not in pivot_df.columns:
-        pivot_df['import'] = 0
-    if 'export' not in pivot_df.columns:
-        pivot_df['export'] = 0
-        
+    pivot_df = (
+        df.groupby(['date', 'meter_type'], sort=False, observed=True)['total_kwh']
+        .sum()
+        .unstack('meter_type', fill_value=0)
+    )
+    pivot_df.columns = pivot_df.columns.astype(str)
+    pivot_df = pivot_df.reindex(columns=['import', 'export'], fill_value=0).reset_index()
+
     pivot_df['net_flow'] = pivot_df['import'] - pivot_df['export']
     
     # Create figure with secondary y-axis if temperature is requested
-    if show_temperature:
-        from plotly.subplots import make_subplots
-        fig = make_subplots(specs=[[{"secondary_y": True}]])
-    else:
-        fig = go.Figure()
+    fig = create_base_figure(show_temperature)
     
     # Create colors based on positive/negative flow
-    colors_net = ['red' if x > 0 else 'green' for x in pivot_df['net_flow']]
+    colors_net = np.where(pivot_df['net_flow'].to_numpy() > 0, 'red', 'green')
     
-    # Add main net flow trace
-    fig.add_trace(go.Bar(
+    # Main net flow trace
+    traces = [dict(
+        type='bar',
         x=pivot_df['date'],
         y=pivot_df['net_flow'],
-        marker_color=colors_net,
+        marker=dict(color=colors_net),
         name='Net Energy Flow',
         hovertemplate='<b>Net Flow</b><br>Date: %{x}<br>Net: %{y:.2f} kWh<br>' +
                      '<i>Positive = Grid Import, Negative = Solar Export</i><extra></extra>'
-    ), secondary_y=False if show_temperature else None)
+    )]
     
     # Add rolling average if requested
     if use_rolling_avg:
         pivot_df_sorted = pivot_df.sort_values('date')
-        pivot_df_sorted['rolling_avg'] = pivot_df_sorted['net_flow'].rolling(window=7, center=True).mean()
+        pivot_df_sorted['rolling_avg'] = centered_rolling_mean(pivot_df_sorted['net_flow'].to_numpy(), 7)
         
-        fig.add_trace(go.Scatter(
-            x=pivot_df_sorted['date'],
-            y=pivot_df_sorted['rolling_avg'],
-            mode='lines',
+        traces.append(line_trace(
+            pivot_df_sorted['date'],
+            pivot_df_sorted['rolling_avg'],
             name='Net Flow (7-day avg)',
             line=dict(color='purple', width=3),
             hovertemplate='<b>Net Flow (7-day avg)</b><br>Date: %{x}<br>Net: %{y:.2f} kWh<extra></extra>'
-        ), secondary_y=False if show_temperature else None)
+        ))
+    
+    fig.add_traces(traces, secondary_ys=[False] * len(traces) if show_temperature else None)
     
     # Add temperature trace if requested
     if show_temperature:
         try:
             weather_df = get_temperature_data(df, use_rolling_avg)
-            if not weather_df.empty:
-                if use_rolling_avg and 'temperature_avg_rolling' in weather_df.columns:
-                    # Show both original and rolling average temperature
-                    fig.add_trace(go.Scatter(
-                        x=weather_df['date'],
-                        y=weather_df['temperature_avg'],
-                        mode='lines',
-                        name='Temperature (daily)',
-                        line=dict(color='orange', width=1, dash='dot'),
-                        opacity=0.4,
-                        yaxis='y2',
-                        hovertemplate='<b>Temperature (daily)</b><br>Date: %{x}<br>Temp: %{y:.1f}°C<extra></extra>'
-                    ), secondary_y=True)
-                    
-                    fig.add_trace(go.Scatter(
-                        x=weather_df['date'],
-                        y=weather_df['temperature_avg_rolling'],
-                        mode='lines',
-                        name='Temperature (avg)',
-                        line=dict(color='orange', width=2),
-                        yaxis='y2',
-                        hovertemplate='<b>Temperature (rolling avg)</b><br>Date: %{x}<br>Temp: %{y:.1f}°C<extra></extra>'
-                    ), secondary_y=True)
-                else:
-                    # Standard temperature line
-                    fig.add_trace(go.Scatter(
-                        x=weather_df['date'],
-                        y=weather_df['temperature_avg'],
-                        mode='lines',
-                        name='Temperature',
-                        line=dict(color='orange', width=2),
-                        yaxis='y2',
-                        hovertemplate='<b>Temperature</b><br>Date: %{x}<br>Temp: %{y:.1f}°C<extra></extra>'
-                    ), secondary_y=True)
-                
-                # Set y-axis titles
-                fig.update_yaxes(title_text='Net Energy (kWh)', secondary_y=False)
-                fig.update_yaxes(title_text='Temperature (°C)', secondary_y=True)
+            add_temperature_traces(fig, weather_df, use_rolling_avg, 'Net Energy (kWh)')
         except Exception as e:
-            print(f"Temperature data not available: {e}")
+            logger.warning("Temperature data not available: %s", e)
     
     # Add zero line
     fig.add_hline(y=0, line_dash="dash", line_color="black", opacity=0.5)
@@ -726,7 +801,6 @@ def create_net_flow_chart(df, show_temperature=False, use_rolling_avg=False):
         title=title,
         xaxis_title='Date',
         yaxis_title='Net Energy (kWh)' if not show_temperature else None,
-        template='plotly_white',
         annotations=[
             dict(
                 x=0.02, y=0.98,
@@ -747,25 +821,26 @@ def create_energy_balance_chart(df):
     if df.empty:
         return create_empty_chart("No data available")
     
-    import_total = df[df['meter_type'] == 'import']['total_kwh'].sum()
-    export_total = df[df['meter_type'] == 'export']['total_kwh'].sum()
-    
-    fig = go.Figure(data=[go.Pie(
-        labels=['Grid Import', 'Solar Export'],
-        values=[import_total, export_total],
-        hole=0.4,
-        marker_colors=[colors['import'], colors['export']],
-        hovertemplate='<b>%{label}</b><br>Energy: %{value:.1f} kWh<br>Percentage: %{percent}<extra></extra>'
-    )])
-    
-    fig.update_layout(
-        title='Energy Balance Overview',
-        template='plotly_white',
-        annotations=[dict(text=f'{import_total + export_total:.1f}<br>Total kWh', 
-                         x=0.5, y=0.5, font_size=14, showarrow=False)]
+    import_data, export_data = split_by_meter_type(df)
+    import_total = import_data['total_kwh'].sum()
+    export_total = export_data['total_kwh'].sum()
+    
+    return go.Figure(
+        data=[dict(
+            type='pie',
+            labels=['Grid Import', 'Solar Export'],
+            values=[import_total, export_total],
+            hole=0.4,
+            marker=dict(colors=[colors['import'], colors['export']]),
+            hovertemplate='<b>%{label}</b><br>Energy: %{value:.1f} kWh<br>Percentage: %{percent}<extra></extra>'
+        )],
+        layout=dict(
+            title='Energy Balance Overview',
+            template='plotly_white',
+            annotations=[dict(text=f'{import_total + export_total:.1f}<br>Total kWh', 
+                             x=0.5, y=0.5, font_size=14, showarrow=False)]
+        )
     )
-    
-    return fig
 
 def create_consumption_pattern_chart(df, use_rolling_avg=False):
     """Create consumption pattern chart showing trends"""
@@ -785,51 +860,57 @@ def create_consumption_pattern_chart(df, use_rolling_avg=False):
     
     # Sort data by date
     df_sorted = df.sort_values('date')
-    import_df = df_sorted[df_sorted['meter_type'] == 'import'].copy()
-    export_df = df_sorted[df_sorted['meter_type'] == 'export'].copy()
+    import_df, export_df = split_by_meter_type(df_sorted)
+    import_df = import_df.copy()
+    export_df = export_df.copy()
+    
+    # Smooth import and export in one pass when they cover the same days
+    trend_window = window if use_rolling_avg else 7
+    if len(import_df) == len(export_df):
+        rolling = centered_rolling_mean(
+            np.column_stack([import_df['total_kwh'].to_numpy(), export_df['total_kwh'].to_numpy()]),
+            trend_window
+        )
+        import_df['rolling_avg'] = rolling[:, 0]
+        export_df['rolling_avg'] = rolling[:, 1]
+    else:
+        import_df['rolling_avg'] = centered_rolling_mean(import_df['total_kwh'].to_numpy(), trend_window)
+        export_df['rolling_avg'] = centered_rolling_mean(export_df['total_kwh'].to_numpy(), trend_window)
     
-    fig = go.Figure()
+    traces = []
     
     if use_rolling_avg:
         # Use custom rolling averages for longer periods
         if not import_df.empty:
-            import_df['rolling_avg'] = import_df['total_kwh'].rolling(window=window, center=True).mean()
-            
             # Show both original data (lighter) and rolling average (bold)
-            fig.add_trace(go.Scatter(
-                x=import_df['date'],
-                y=import_df['total_kwh'],
-                mode='lines',
+            traces.append(line_trace(
+                import_df['date'],
+                import_df['total_kwh'],
                 name='Import (daily)',
                 line=dict(color=colors['import'], width=1),
                 opacity=0.3
             ))
             
-            fig.add_trace(go.Scatter(
-                x=import_df['date'],
-                y=import_df['rolling_avg'],
-                mode='lines',
+            traces.append(line_trace(
+                import_df['date'],
+                import_df['rolling_avg'],
                 name=f'Import ({window}-day avg)',
                 line=dict(color=colors['import'], width=3)
             ))
         
         if not export_df.empty:
-            export_df['rolling_avg'] = export_df['total_kwh'].rolling(window=window, center=True).mean()
-            
             # Show both original data (lighter) and rolling average (bold)
-            fig.add_trace(go.Scatter(
-                x=export_df['date'],
-                y=export_df['total_kwh'],
-                mode='lines',
+            traces.append(line_trace(
+                export_df['date'],
+                export_df['total_kwh'],
                 name='Export (daily)',
                 line=dict(color=colors['export'], width=1),
                 opacity=0.3
             ))
             
-            fig.add_trace(go.Scatter(
-                x=export_df['date'],
-                y=export_df['rolling_avg'],
-                mode='lines',
+            traces.append(line_trace(
+                export_df['date'],
+                export_df['rolling_avg'],
                 name=f'Export ({window}-day avg)',
                 line=dict(color=colors['export'], width=3)
             ))
@@ -839,21 +920,17 @@ def create_consumption_pattern_chart(df, use_rolling_avg=False):
     else:
         # Standard trend lines (7-day rolling average)
         if not import_df.empty:
-            import_df['rolling_avg'] = import_df['total_kwh'].rolling(window=7, center=True).mean()
-            fig.add_trace(go.Scatter(
-                x=import_df['date'],
-                y=import_df['rolling_avg'],
-                mode='lines',
+            traces.append(line_trace(
+                import_df['date'],
+                import_df['rolling_avg'],
                 name='Import Trend (7-day avg)',
                 line=dict(color=colors['import'], width=2, dash='dash')
             ))
         
         if not export_df.empty:
-            export_df['rolling_avg'] = export_df['total_kwh'].rolling(window=7, center=True).mean()
-            fig.add_trace(go.Scatter(
-                x=export_df['date'],
-                y=export_df['rolling_avg'],
-                mode='lines',
+            traces.append(line_trace(
+                export_df['date'],
+                export_df['rolling_avg'],
                 name='Export Trend (7-day avg)',
                 line=dict(color=colors['export'], width=2, dash='dash')
             ))
@@ -861,14 +938,15 @@ def create_consumption_pattern_chart(df, use_rolling_avg=False):
         title = 'Energy Consumption Trends'
         yaxis_title = '7-day Average (kWh)'
     
-    fig.update_layout(
-        title=title,
-        xaxis_title='Date',
-        yaxis_title=yaxis_title,
-        template='plotly_white'
+    return go.Figure(
+        data=traces,
+        layout=dict(
+            title=title,
+            xaxis_title='Date',
+            yaxis_title=yaxis_title,
+            template='plotly_white'
+        )
     )
-    
-    return fig
 
 def create_empty_chart(message):
     """Create an empty chart with a message"""
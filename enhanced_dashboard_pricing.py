@@ -3,12 +3,19 @@
 Enhanced dashboard pricing integration with tariff transitions and Agile pricing visualization.
 """
 
+import numpy as np
 import pandas as pd
 import plotly.graph_objs as go
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 from bill_accurate_pricing import BillAccuratePricingProcessor
 
+# Number of (start, end, frequency) price series kept between chart builds
+PRICE_SERIES_CACHE_SIZE = 16
+
+# Price traces longer than this are thinned before plotting
+MAX_PRICE_POINTS = 2000
+
 class EnhancedDashboardPricing:
     """Enhanced pricing system for dashboard with transition marking and Agile support."""
     
@@ -22,90 +29,122 @@ class EnhancedDashboardPricing:
             'transition': '#ffc107',
             'agile': '#6f42c1'
         }
+        agile = self.colors['agile']
+        self._agile_fill = f'rgba({int(agile[1:3], 16)}, {int(agile[3:5], 16)}, {int(agile[5:7], 16)}, 0.2)'
+        self.period_rates = self._build_period_rates()
+        self._agile_codes = self._find_agile_codes()
+        self._price_series_cache = {}
+    
+    def reload_tariffs(self):
+        """Re-read the tariff configuration and drop results priced with the old one."""
+        self.bill_processor.load_configuration()
+        self.period_rates = self._build_period_rates()
+        self._agile_codes = self._find_agile_codes()
+        self._price_series_cache.clear()
+    
+    def _find_agile_codes(self) -> frozenset:
+        """Tariff codes in the configuration that are Agile tariffs."""
+        return frozenset(code for code in self.period_rates['tariff_code']
+                         if self.bill_processor.is_agile_tariff(code))
+    
+    def _build_period_rates(self) -> pd.DataFrame:
+        """Tabulate each tariff period's rates once, in tariff_periods order."""
+        rows = []
+        for period in self.bill_processor.tariff_periods:
+            row = {
+                'is_tou': period['rate_type'] == 'time_of_use',
+                'day_rate': 0.0,
+                'night_rate': 0.0,
+                'fixed_rate': 0.0,
+                'standing_charge': float(period['standing_charge_pence_per_day']),
+                'tariff_code': period['tariff_code']
+            }
+            if row['is_tou']:
+                for rate in period['time_of_use_rates']:
+                    if rate['rate_name'] == 'Day':
+                        row['day_rate'] = float(rate['rate_pence_per_kwh'])
+                    elif rate['rate_name'] == 'Night':
+                        row['night_rate'] = float(rate['rate_pence_per_kwh'])
+                row['rate_type'] = f"Day/Night (D:{row['day_rate']:.2f}p N:{row['night_rate']:.2f}p)"
+            else:
+                row['fixed_rate'] = float(period['rate_pence_per_kwh'])
+                row['rate_type'] = f"Fixed ({row['fixed_rate']:.2f}p)"
+            rows.append(row)
+        return pd.DataFrame(rows, columns=['is_tou', 'day_rate', 'night_rate', 'fixed_rate',
+                                           'standing_charge', 'tariff_code', 'rate_type'])
     
     def calculate_daily_costs(self, daily_df: pd.DataFrame) -> pd.DataFrame:
         """Calculate daily costs using bill-accurate pricing."""
         if daily_df.empty:
             return daily_df.copy()
         
-        result_df = daily_df.copy()
-        
-        # Add cost columns
-        result_df['cost_pence'] = 0.0
-        result_df['cost_pounds'] = 0.0
-        result_df['total_cost_pence'] = 0.0
-        result_df['total_cost_pounds'] = 0.0
-        result_df['standing_charge_pence'] = 0.0
-        result_df['standing_charge_pounds'] = 0.0
-        result_df['rate_pence_per_kwh'] = 0.0
-        result_df['tariff_code'] = ''
-        result_df['rate_type'] = ''
-        
-        for index, row in result_df.iterrows():
-            date = row['date']
-            meter_type = row['meter_type']
-            total_kwh = row['total_kwh']
-            
-            # Convert date to datetime for tariff lookup
-            if isinstance(date, str):
-                lookup_date = pd.to_datetime(date)
-            else:
-                lookup_date = date
-            
-            # Find tariff period for this date
-            tariff_period = self.bill_processor.find_tariff_period(lookup_date)
-            
-            if tariff_period is None:
-                continue
-            
-            # For daily calculations, we need to estimate the distribution across day/night
-            # This is a simplified approach - for exact calculations, we'd need half-hourly data
-            if tariff_period['rate_type'] == 'time_of_use':
-                # Get day and night rates
-                day_rate = 0
-                night_rate = 0
-                for rate in tariff_period['time_of_use_rates']:
-                    if rate['rate_name'] == 'Day':
-                        day_rate = rate['rate_pence_per_kwh']
-                    elif rate['rate_name'] == 'Night':
-                        night_rate = rate['rate_pence_per_kwh']
-                
-                # Estimate 16 hours day (07:00-23:00) and 8 hours night (23:00-07:00)
-                # Assume more consumption during day for typical household
-                day_proportion = 0.7  # 70% of daily consumption during day hours
-                night_proportion = 0.3  # 30% during night hours
-                
-                day_kwh = total_kwh * day_proportion
-                night_kwh = total_kwh * night_proportion
-                
-                cost_pence = (day_kwh * day_rate) + (night_kwh * night_rate)
-                avg_rate = cost_pence / total_kwh if total_kwh > 0 else 0
-                rate_type_text = f"Day/Night (D:{day_rate:.2f}p N:{night_rate:.2f}p)"
-                
-            else:
-                # Fixed rate
-                rate = tariff_period['rate_pence_per_kwh']
-                cost_pence = total_kwh * rate
-                avg_rate = rate
-                rate_type_text = f"Fixed ({rate:.2f}p)"
-            
-            # Calculate standing charge (only for import)
-            standing_charge_pence = 0.0
-            if meter_type == 'import':
-                standing_charge_pence = tariff_period['standing_charge_pence_per_day']
-            
-            # Update result
-            result_df.at[index, 'cost_pence'] = cost_pence
-            result_df.at[index, 'cost_pounds'] = cost_pence / 100
-            result_df.at[index, 'standing_charge_pence'] = standing_charge_pence
-            result_df.at[index, 'standing_charge_pounds'] = standing_charge_pence / 100
-            result_df.at[index, 'total_cost_pence'] = cost_pence + standing_charge_pence
-            result_df.at[index, 'total_cost_pounds'] = (cost_pence + standing_charge_pence) / 100
-            result_df.at[index, 'rate_pence_per_kwh'] = avg_rate
-            result_df.at[index, 'tariff_code'] = tariff_period['tariff_code']
-            result_df.at[index, 'rate_type'] = rate_type_text
-        
-        return result_df
+        # Match every row to its tariff period in one lookup
+        period_idx = self.bill_processor.find_tariff_period_indices(pd.DatetimeIndex(pd.to_datetime(daily_df['date'])))
+        matched = period_idx >= 0
+        idx = period_idx[matched]
+        
+        # Gather the precomputed per-period rates onto the matched rows
+        rates = self.period_rates
+        row_is_tou = rates['is_tou'].to_numpy()[idx]
+        day_rates = rates['day_rate'].to_numpy()[idx]
+        night_rates = rates['night_rate'].to_numpy()[idx]
+        fixed_rates = rates['fixed_rate'].to_numpy()[idx]
+        
+        total_kwh = daily_df['total_kwh'].to_numpy(dtype=float)[matched]
+        
+        # For daily calculations, we need to estimate the distribution across day/night
+        # This is a simplified approach - for exact calculations, we'd need half-hourly data.
+        # Assume 70% of daily consumption during day hours (07:00-23:00) and 30% at night
+        day_proportion = 0.7
+        night_proportion = 0.3
+        tou_cost = (total_kwh * day_proportion) * day_rates
+        tou_cost += (total_kwh * night_proportion) * night_rates
+        tou_avg_rate = np.divide(tou_cost, total_kwh, out=np.zeros_like(tou_cost), where=total_kwh > 0)
+        
+        # Result columns are built whole; rows without a tariff period keep zero cost
+        n = len(daily_df)
+        cost_pence = np.zeros(n)
+        cost_pence[matched] = np.where(row_is_tou, tou_cost, total_kwh * fixed_rates)
+        rate_pence_per_kwh = np.zeros(n)
+        rate_pence_per_kwh[matched] = np.where(row_is_tou, tou_avg_rate, fixed_rates)
+        
+        # Standing charge only applies to import
+        standing_charge_pence = np.zeros(n)
+        is_import = daily_df['meter_type'].to_numpy()[matched] == 'import'
+        standing_charge_pence[matched] = np.where(is_import, rates['standing_charge'].to_numpy()[idx], 0.0)
+        
+        # Labels repeat for every day of a tariff period, so keep them categorical
+        tariff_code = np.full(n, '', dtype=object)
+        tariff_code[matched] = rates['tariff_code'].to_numpy()[idx]
+        rate_type = np.full(n, '', dtype=object)
+        rate_type[matched] = rates['rate_type'].to_numpy()[idx]
+        tariff_code = pd.Categorical(tariff_code)
+        rate_type = pd.Categorical(rate_type)
+        
+        total_cost_pence = cost_pence + standing_charge_pence
+        
+        return daily_df.assign(
+            cost_pence=cost_pence,
+            cost_pounds=cost_pence / 100,
+            total_cost_pence=total_cost_pence,
+            total_cost_pounds=total_cost_pence / 100,
+            standing_charge_pence=standing_charge_pence,
+            standing_charge_pounds=standing_charge_pence / 100,
+            rate_pence_per_kwh=rate_pence_per_kwh,
+            tariff_code=tariff_code,
+            rate_type=rate_type
+        )
+    
+    def _get_price_series(self, start_date: str, end_date: str, frequency: str) -> pd.DataFrame:
+        """Price series shared between chart builds (shared result, do not modify)."""
+        key = (start_date, end_date, frequency)
+        price_df = self._price_series_cache.get(key)
+        if price_df is None:
+            if len(self._price_series_cache) >= PRICE_SERIES_CACHE_SIZE:
+                self._price_series_cache.pop(next(iter(self._price_series_cache)))
+            price_df = self.bill_processor.create_price_series(start_date, end_date, frequency)
+            self._price_series_cache[key] = price_df
+        return price_df
     
     def get_summary_stats(self, daily_df: pd.DataFrame) -> Dict:
         """Calculate summary financial statistics using bill-accurate pricing."""
@@ -114,12 +153,20 @@ class EnhancedDashboardPricing:
         if df_with_costs.empty:
             return {}
             
-        import_data = df_with_costs[df_with_costs['meter_type'] == 'import']
-        export_data = df_with_costs[df_with_costs['meter_type'] == 'export']
+        # Per-meter totals and latest rates in a single groupby pass
+        totals = df_with_costs.groupby('meter_type', observed=True, sort=False).agg(
+            cost_pounds=('cost_pounds', 'sum'),
+            standing_charge_pounds=('standing_charge_pounds', 'sum'),
+            rate_pence_per_kwh=('rate_pence_per_kwh', 'last'),
+            tariff_code=('tariff_code', 'last'),
+            standing_charge_pence=('standing_charge_pence', 'last')
+        )
+        has_import = 'import' in totals.index
+        has_export = 'export' in totals.index
         
-        total_import_cost = import_data['cost_pounds'].sum() if not import_data.empty else 0
-        total_export_earnings = export_data['cost_pounds'].sum() if not export_data.empty else 0
-        total_standing_charges = import_data['standing_charge_pounds'].sum() if not import_data.empty else 0
+        total_import_cost = totals.at['import', 'cost_pounds'] if has_import else 0
+        total_export_earnings = totals.at['export', 'cost_pounds'] if has_export else 0
+        total_standing_charges = totals.at['import', 'standing_charge_pounds'] if has_import else 0
         
         total_bill = total_import_cost + total_standing_charges
         net_cost = total_bill - total_export_earnings
@@ -128,20 +175,10 @@ class EnhancedDashboardPricing:
         days_count = len(daily_df['date'].unique()) if not daily_df.empty else 1
         
         # Get current rates for display
-        if not import_data.empty:
-            latest_import = import_data.iloc[-1]
-            import_rate = latest_import['rate_pence_per_kwh']
-            tariff_code = latest_import['tariff_code']
-        else:
-            import_rate = 0
-            tariff_code = ''
-        
-        if not export_data.empty:
-            export_rate = export_data.iloc[-1]['rate_pence_per_kwh']
-        else:
-            export_rate = 0
-        
-        standing_charge = import_data.iloc[-1]['standing_charge_pence'] if not import_data.empty else 0
+        import_rate = totals.at['import', 'rate_pence_per_kwh'] if has_import else 0
+        tariff_code = totals.at['import', 'tariff_code'] if has_import else ''
+        export_rate = totals.at['export', 'rate_pence_per_kwh'] if has_export else 0
+        standing_charge = totals.at['import', 'standing_charge_pence'] if has_import else 0
         
         return {
             'total_import_cost': total_import_cost,
@@ -218,7 +255,8 @@ class EnhancedDashboardPricing:
         return fig
     
     def add_price_overlay_to_figure(self, fig, start_date: str, end_date: str, 
-                                  chart_type: str = 'daily', use_rolling_avg: bool = False) -> go.Figure:
+                                  chart_type: str = 'daily', use_rolling_avg: bool = False,
+                                  max_points: Optional[int] = MAX_PRICE_POINTS) -> go.Figure:
         """Add price overlay to existing consumption/cost charts."""
         
         if not self.bill_processor.tariff_periods:
@@ -228,23 +266,22 @@ class EnhancedDashboardPricing:
         frequency = 'H' if chart_type == 'hourly' else 'D'
         
         # Get price series
-        price_df = self.bill_processor.create_price_series(start_date, end_date, frequency)
+        price_df = self._get_price_series(start_date, end_date, frequency)
         
         if price_df.empty:
             return fig
         
         # Check if we have any Agile tariffs in the period
-        has_agile = any(self.bill_processor.is_agile_tariff(code) for code in price_df['tariff_code'].unique())
+        has_agile = not self._agile_codes.isdisjoint(price_df['tariff_code'].unique())
         
         # Add price trace on secondary y-axis
         if chart_type == 'hourly':
             # For hourly view, show average rates by hour
-            price_df['hour'] = price_df['timestamp'].dt.hour
-            hourly_avg_price = price_df.groupby('hour')['rate_pence_per_kwh'].mean().reset_index()
+            hourly_avg_price = self._hourly_rate_stats(price_df)
             
             fig.add_trace(go.Scatter(
-                x=hourly_avg_price['hour'],
-                y=hourly_avg_price['rate_pence_per_kwh'],
+                x=hourly_avg_price['hour'].to_numpy(),
+                y=hourly_avg_price['mean'].to_numpy(),
                 mode='lines+markers',
                 name='Avg Hourly Rate',
                 line=dict(color=self.colors['price_line'], width=3),
@@ -258,12 +295,17 @@ class EnhancedDashboardPricing:
             if use_rolling_avg and len(price_df) > 7:
                 # Add rolling average for price
                 price_df_sorted = price_df.sort_values('timestamp')
-                price_df_sorted['price_rolling'] = price_df_sorted['rate_pence_per_kwh'].rolling(window=7, center=True).mean()
+                # Centred 7-day mean as a plain convolution; edges without a full window stay NaN
+                price_rolling = np.convolve(price_df_sorted['rate_pence_per_kwh'].to_numpy(dtype=float), np.ones(7) / 7, mode='same')
+                price_rolling[:3] = np.nan
+                price_rolling[-3:] = np.nan
+                price_df_sorted['price_rolling'] = price_rolling
+                price_df_sorted = self._downsample(price_df_sorted, max_points)
                 
                 # Show both original price (lighter) and rolling average
                 fig.add_trace(go.Scatter(
-                    x=price_df_sorted['timestamp'],
-                    y=price_df_sorted['rate_pence_per_kwh'],
+                    x=price_df_sorted['timestamp'].to_numpy(),
+                    y=price_df_sorted['rate_pence_per_kwh'].to_numpy(),
                     mode='lines',
                     name='Daily Rate',
                     line=dict(color=self.colors['price_line'], width=1, dash='dot'),
@@ -273,8 +315,8 @@ class EnhancedDashboardPricing:
                 ))
                 
                 fig.add_trace(go.Scatter(
-                    x=price_df_sorted['timestamp'],
-                    y=price_df_sorted['price_rolling'],
+                    x=price_df_sorted['timestamp'].to_numpy(),
+                    y=price_df_sorted['price_rolling'].to_numpy(),
                     mode='lines',
                     name='Rate (7-day avg)',
                     line=dict(color=self.colors['price_line'], width=3),
@@ -283,20 +325,21 @@ class EnhancedDashboardPricing:
                 ))
             else:
                 # Standard price line
+                price_df = self._downsample(price_df, max_points)
                 price_trace_name = 'Energy Rate'
                 if has_agile:
                     price_trace_name = 'Agile Rate'
                 
                 fig.add_trace(go.Scatter(
-                    x=price_df['timestamp'],
-                    y=price_df['rate_pence_per_kwh'],
+                    x=price_df['timestamp'].to_numpy(),
+                    y=price_df['rate_pence_per_kwh'].to_numpy(),
                     mode='lines+markers' if len(price_df) < 50 else 'lines',
                     name=price_trace_name,
                     line=dict(color=self.colors['agile'] if has_agile else self.colors['price_line'], width=3),
                     marker=dict(size=6) if len(price_df) < 50 else None,
                     yaxis='y2',
                     hovertemplate=f'<b>{price_trace_name}</b><br>Date: %{{x}}<br>Rate: %{{y:.2f}}p/kWh<br>Tariff: %{{customdata}}<extra></extra>',
-                    customdata=price_df['tariff_code']
+                    customdata=price_df['tariff_code'].to_numpy()
                 ))
         
         # Update layout to include secondary y-axis
@@ -311,30 +354,28 @@ class EnhancedDashboardPricing:
         
         return fig
     
-    def create_price_comparison_chart(self, start_date: str, end_date: str) -> go.Figure:
+    def create_price_comparison_chart(self, start_date: str, end_date: str,
+                                      max_points: Optional[int] = MAX_PRICE_POINTS) -> go.Figure:
         """Create a dedicated price comparison chart showing rate variations."""
         
-        price_df = self.bill_processor.create_price_series(start_date, end_date, 'D')
+        price_df = self._get_price_series(start_date, end_date, 'D')
         
         if price_df.empty:
             return self._create_empty_chart("No pricing data available")
         
         fig = go.Figure()
         
-        # Group by tariff periods to show different colors
-        tariff_codes = price_df['tariff_code'].unique()
-        
-        for tariff_code in tariff_codes:
-            tariff_data = price_df[price_df['tariff_code'] == tariff_code].copy()
-            
+        # Group by tariff periods to show different colors (one pass, in order of appearance)
+        for tariff_code, tariff_data in price_df.groupby('tariff_code', sort=False):
+            tariff_data = self._downsample(tariff_data, max_points)
             # Determine color based on tariff type
-            is_agile = self.bill_processor.is_agile_tariff(tariff_code)
+            is_agile = tariff_code in self._agile_codes
             color = self.colors['agile'] if is_agile else self.colors['price_line']
             
             # Add trace for this tariff period
             fig.add_trace(go.Scatter(
-                x=tariff_data['timestamp'],
-                y=tariff_data['rate_pence_per_kwh'],
+                x=tariff_data['timestamp'].to_numpy(),
+                y=tariff_data['rate_pence_per_kwh'].to_numpy(),
                 mode='lines+markers',
                 name=tariff_code,
                 line=dict(color=color, width=3),
@@ -367,27 +408,25 @@ class EnhancedDashboardPricing:
     def create_agile_hourly_pattern_chart(self, start_date: str, end_date: str) -> go.Figure:
         """Create hourly pattern chart for Agile tariffs showing typical daily rates."""
         
-        price_df = self.bill_processor.create_price_series(start_date, end_date, 'H')
+        price_df = self._get_price_series(start_date, end_date, 'H')
         
         if price_df.empty:
             return self._create_empty_chart("No hourly pricing data available")
         
         # Check if we have Agile data
-        has_agile = any(self.bill_processor.is_agile_tariff(code) for code in price_df['tariff_code'].unique())
+        has_agile = not self._agile_codes.isdisjoint(price_df['tariff_code'].unique())
         
-        price_df['hour'] = price_df['timestamp'].dt.hour
-        price_df['weekday'] = price_df['timestamp'].dt.day_name()
+        hourly_stats = self._hourly_rate_stats(price_df)
         
         fig = go.Figure()
         
         if has_agile:
             # For Agile: show distribution of rates by hour
-            hourly_stats = price_df.groupby('hour')['rate_pence_per_kwh'].agg(['mean', 'std', 'min', 'max']).reset_index()
             
             # Add mean line
             fig.add_trace(go.Scatter(
-                x=hourly_stats['hour'],
-                y=hourly_stats['mean'],
+                x=hourly_stats['hour'].to_numpy(),
+                y=hourly_stats['mean'].to_numpy(),
                 mode='lines+markers',
                 name='Average Rate',
                 line=dict(color=self.colors['agile'], width=3),
@@ -399,7 +438,7 @@ class EnhancedDashboardPricing:
                 x=hourly_stats['hour'].tolist() + hourly_stats['hour'][::-1].tolist(),
                 y=hourly_stats['max'].tolist() + hourly_stats['min'][::-1].tolist(),
                 fill='toself',
-                fillcolor=f'rgba({int(self.colors["agile"][1:3], 16)}, {int(self.colors["agile"][3:5], 16)}, {int(self.colors["agile"][5:7], 16)}, 0.2)',
+                fillcolor=self._agile_fill,
                 line=dict(color='rgba(255,255,255,0)'),
                 name='Rate Range (Min-Max)',
                 hoverinfo='skip'
@@ -408,11 +447,9 @@ class EnhancedDashboardPricing:
             title = 'Agile Tariff: Hourly Rate Patterns'
         else:
             # For time-of-use: show day/night pattern
-            hourly_avg = price_df.groupby('hour')['rate_pence_per_kwh'].mean().reset_index()
-            
             fig.add_trace(go.Scatter(
-                x=hourly_avg['hour'],
-                y=hourly_avg['rate_pence_per_kwh'],
+                x=hourly_stats['hour'].to_numpy(),
+                y=hourly_stats['mean'].to_numpy(),
                 mode='lines+markers',
                 name='Time-of-Use Rate',
                 line=dict(color=self.colors['price_line'], width=3),
@@ -463,6 +500,50 @@ class EnhancedDashboardPricing:
         
         return fig
     
+    def _hourly_rate_stats(self, price_df: pd.DataFrame) -> pd.DataFrame:
+        """Mean, std, min and max rate for each hour of the day present in a price series."""
+        hours = price_df['timestamp'].dt.hour.to_numpy()
+        rates = price_df['rate_pence_per_kwh'].to_numpy(dtype=float)
+        
+        # 24 fixed buckets, so bincount and ufunc.at beat a pandas groupby
+        counts = np.bincount(hours, minlength=24)
+        present = counts > 0
+        mean = np.bincount(hours, weights=rates, minlength=24) / np.maximum(counts, 1)
+        squared_deviations = np.bincount(hours, weights=(rates - mean[hours]) ** 2, minlength=24)
+        std = np.full(24, np.nan)
+        np.divide(squared_deviations, counts - 1, out=std, where=counts > 1)
+        std = np.sqrt(std)
+        low = np.full(24, np.inf)
+        high = np.full(24, -np.inf)
+        np.minimum.at(low, hours, rates)
+        np.maximum.at(high, hours, rates)
+        
+        return pd.DataFrame({
+            'hour': np.flatnonzero(present).astype(hours.dtype),
+            'mean': mean[present],
+            'std': std[present],
+            'min': low[present],
+            'max': high[present]
+        })
+    
+    def _downsample(self, df: pd.DataFrame, max_points: Optional[int]) -> pd.DataFrame:
+        """Thin a frame to at most max_points rows, keeping each bucket's lowest and highest rate."""
+        if max_points is None or len(df) <= max_points:
+            return df
+        
+        # Two rows survive per bucket, so price spikes and negative slots are never dropped
+        bucket_size = -(-len(df) // max(max_points // 2, 1))
+        n_buckets = -(-len(df) // bucket_size)
+        rates = np.full(n_buckets * bucket_size, np.nan)
+        rates[:len(df)] = df['rate_pence_per_kwh'].to_numpy(dtype=float)
+        buckets = rates.reshape(n_buckets, bucket_size)
+        
+        starts = np.arange(n_buckets) * bucket_size
+        lowest = starts + np.where(np.isnan(buckets), np.inf, buckets).argmin(axis=1)
+        highest = starts + np.where(np.isnan(buckets), -np.inf, buckets).argmax(axis=1)
+        keep = np.union1d(lowest, highest)
+        return df.iloc[keep[keep < len(df)]]
+    
     def _create_empty_chart(self, message: str) -> go.Figure:
         """Create an empty chart with a message."""
         fig = go.Figure()
@@ -7,21 +7,92 @@ Fetches historical pricing data and matches it with consumption data for accurat
 import pandas as pd
 import os
 import argparse
+import importlib.util
 from datetime import datetime, timedelta
+from typing import Optional
 from octopus_pricing_api import OctopusPricingAPI
 import numpy as np
 
+# Cache fetched pricing as parquet when a parquet engine is installed (pandas imports it on use)
+PARQUET_AVAILABLE = importlib.util.find_spec('pyarrow') is not None
+
+PRICING_CACHE_DIR = '.pricing_cache'
+
+# Columns (and their dtypes) read from the consumption and enhanced CSVs; kWh stays float64
+CONSUMPTION_COLUMNS = ['interval_start', 'interval_end', 'consumption', 'meter_type']
+CONSUMPTION_DTYPES = {'meter_type': 'category'}
+SUMMARY_COLUMNS = ['interval_start', 'consumption', 'meter_type', 'cost_inc_vat', 'cost_exc_vat',
+                   'standing_charge', 'rate_inc_vat']
+
+
+def _load_or_fetch_pricing(api: OctopusPricingAPI, tariff_code: str, start_date, end_date,
+                           is_export: bool = False, cache_dir: Optional[str] = PRICING_CACHE_DIR) -> pd.DataFrame:
+    """
+    Get historical pricing for a tariff, fetching from the API only what is not cached on disk
+    
+    The cache covers one contiguous span per tariff; only the days before or after it are fetched.
+    Passing cache_dir=None always fetches from the API.
+    """
+    if not PARQUET_AVAILABLE or cache_dir is None:
+        return api.get_historical_pricing_data(tariff_code, start_date, end_date, is_export=is_export)
+    
+    cache_file = os.path.join(cache_dir, f"{tariff_code}.parquet")
+    cached_df = pd.read_parquet(cache_file) if os.path.exists(cache_file) else pd.DataFrame()
+    
+    # Work out which ends of the requested range the cache does not cover
+    if cached_df.empty:
+        missing_ranges = [(start_date, end_date)]
+    else:
+        covered_from = cached_df['valid_from'].min()
+        covered_to = cached_df['valid_to'].max()
+        missing_ranges = []
+        if start_date < covered_from:
+            missing_ranges.append((start_date, covered_from))
+        if end_date >= covered_to:
+            missing_ranges.append((covered_to, end_date))
+    
+    fetched = [api.get_historical_pricing_data(tariff_code, range_start, range_end, is_export=is_export)
+               for range_start, range_end in missing_ranges]
+    fetched = [df for df in fetched if not df.empty]
+    
+    if fetched:
+        cached_df = pd.concat([df for df in [cached_df] + fetched if not df.empty], ignore_index=True)
+        cached_df = cached_df.drop_duplicates('valid_from', keep='last').sort_values('valid_from', ignore_index=True)
+        os.makedirs(cache_dir, exist_ok=True)
+        cached_df.to_parquet(cache_file, index=False, compression='zstd')
+    
+    if cached_df.empty:
+        return cached_df
+    
+    # Only hand back the periods that can match consumption in the requested range
+    in_range = (cached_df['valid_to'] > start_date) & (cached_df['valid_from'] <= end_date)
+    return cached_df[in_range].reset_index(drop=True)
+
+
+def _sort_pricing(pricing_df: pd.DataFrame) -> pd.DataFrame:
+    """Order pricing periods by valid_from with one row per start, as the interval join expects"""
+    if pricing_df.empty or (pricing_df['valid_from'].is_monotonic_increasing and pricing_df['valid_from'].is_unique):
+        return pricing_df
+    
+    return (pricing_df.sort_values('valid_from', kind='stable')
+            .drop_duplicates('valid_from', keep='last')
+            .reset_index(drop=True))
+
 
 def process_consumption_with_real_pricing(consumption_file: str = 'octopus_consumption_raw.csv',
                                         output_file: str = 'octopus_consumption_with_pricing.csv',
-                                        date_limit_days: int = None):
+                                        date_limit_days: int = None,
+                                        output_format: str = 'csv',
+                                        use_pricing_cache: bool = True):
     """
     Process consumption data and add real historical pricing
     
     Args:
         consumption_file: Path to consumption CSV file
-        output_file: Path for output CSV file with pricing
+        output_file: Path for output file with pricing
         date_limit_days: Limit processing to last N days (to avoid too many API calls)
+        output_format: 'csv' or 'parquet' (smaller and faster to reload, needs pyarrow)
+        use_pricing_cache: Reuse variable pricing cached on disk (needs pyarrow)
     """
     
     print("🚀 Enhanced Pricing Processor")
@@ -45,13 +116,17 @@ def process_consumption_with_real_pricing(consumption_file: str = 'octopus_consu
         return False
     
     try:
-        consumption_df = pd.read_csv(consumption_file)
+        consumption_df = pd.read_csv(consumption_file, usecols=CONSUMPTION_COLUMNS, dtype=CONSUMPTION_DTYPES)
         print(f"✅ Loaded {len(consumption_df)} consumption records")
         
-        # Convert timestamps
+        # Convert timestamps (files can mix GMT/BST offsets, so normalise to UTC here rather than via parse_dates)
         consumption_df['interval_start'] = pd.to_datetime(consumption_df['interval_start'], utc=True)
         consumption_df['interval_end'] = pd.to_datetime(consumption_df['interval_end'], utc=True)
         
+        # Keep records in time order so date cut-offs are a binary search rather than a full mask
+        if not consumption_df['interval_start'].is_monotonic_increasing:
+            consumption_df = consumption_df.sort_values('interval_start', kind='stable', ignore_index=True)
+        
         # Get date range
         start_date = consumption_df['interval_start'].min()
         end_date = consumption_df['interval_start'].max()
@@ -61,7 +136,8 @@ def process_consumption_with_real_pricing(consumption_file: str = 'octopus_consu
         # Apply date limit if specified
         if date_limit_days:
             cutoff_date = datetime.now(consumption_df['interval_start'].dt.tz) - timedelta(days=date_limit_days)
-            consumption_df = consumption_df[consumption_df['interval_start'] >= cutoff_date]
+            first_row = consumption_df['interval_start'].searchsorted(pd.Timestamp(cutoff_date), side='left')
+            consumption_df = consumption_df.iloc[first_row:]
             start_date = consumption_df['interval_start'].min()
             print(f"📅 Limited to last {date_limit_days} days: {start_date.date()} to {end_date.date()}")
             print(f"📊 Filtered to {len(consumption_df)} records")
@@ -83,19 +159,21 @@ def process_consumption_with_real_pricing(consumption_file: str = 'octopus_consu
         return False
     
     # Identify import and export tariffs
-    import_tariff = None
-    export_tariff = None
-    
+    tariffs_by_direction = {False: [], True: []}
     for tariff in tariffs:
-        if tariff.is_export:
-            export_tariff = tariff
-        else:
-            import_tariff = tariff
+        tariffs_by_direction[tariff.is_export].append(tariff)
+    import_tariffs, export_tariffs = tariffs_by_direction[False], tariffs_by_direction[True]
     
-    if not import_tariff:
+    if not import_tariffs:
         print("❌ No import tariff found")
         return False
     
+    # Consumption data is not split by meter point, so only the last tariff of each direction is priced
+    import_tariff = import_tariffs[-1]
+    export_tariff = export_tariffs[-1] if export_tariffs else None
+    for ignored in import_tariffs[:-1] + export_tariffs[:-1]:
+        print(f"⚠️  Ignoring additional tariff: {ignored.tariff_code}")
+    
     print(f"📊 Import tariff: {import_tariff.tariff_code} (Variable: {import_tariff.is_variable})")
     if export_tariff:
         print(f"📊 Export tariff: {export_tariff.tariff_code} (Variable: {export_tariff.is_variable})")
@@ -103,16 +181,21 @@ def process_consumption_with_real_pricing(consumption_file: str = 'octopus_consu
     # Fetch pricing data
     print(f"\n💰 Fetching historical pricing data...")
     
+    # Fetches run one after the other: they share the API client's requests.Session
+    cache_dir = PRICING_CACHE_DIR if use_pricing_cache else None
+    
     # Get import pricing data
     import_pricing_df = pd.DataFrame()
     if import_tariff.is_variable:
         print(f"🔍 Fetching variable import pricing for {import_tariff.tariff_code}...")
-        import_pricing_df = api.get_historical_pricing_data(
+        import_pricing_df = _sort_pricing(_load_or_fetch_pricing(
+            api,
             import_tariff.tariff_code, 
             start_date, 
             end_date,
-            is_export=False
-        )
+            is_export=False,
+            cache_dir=cache_dir
+        ))
     else:
         print(f"📊 Using fixed import rate: {import_tariff.unit_rate}p/kWh")
         # Create a simple pricing DataFrame for fixed rates
@@ -128,12 +211,14 @@ def process_consumption_with_real_pricing(consumption_file: str = 'octopus_consu
     if export_tariff:
         if export_tariff.is_variable:
             print(f"🔍 Fetching variable export pricing for {export_tariff.tariff_code}...")
-            export_pricing_df = api.get_historical_pricing_data(
+            export_pricing_df = _sort_pricing(_load_or_fetch_pricing(
+                api,
                 export_tariff.tariff_code, 
                 start_date, 
                 end_date,
-                is_export=True
-            )
+                is_export=True,
+                cache_dir=cache_dir
+            ))
         else:
             print(f"📊 Using fixed export rate: {export_tariff.unit_rate}p/kWh")
             # Create a simple pricing DataFrame for fixed rates
@@ -160,12 +245,25 @@ def process_consumption_with_real_pricing(consumption_file: str = 'octopus_consu
     # Calculate summary statistics
     print(f"\n📊 Pricing Analysis Summary:")
     
+    # One grouped pass gives every per-meter figure (price columns come back as object dtype)
+    stat_columns = ['consumption', 'cost_inc_vat', 'standing_charge', 'rate_inc_vat']
+    stats = (enhanced_df[['meter_type'] + stat_columns]
+             .astype({col: float for col in stat_columns})
+             .groupby('meter_type', observed=True)
+             .agg(kwh=('consumption', 'sum'),
+                  cost=('cost_inc_vat', 'sum'),
+                  standing=('standing_charge', 'sum'),
+                  min_rate=('rate_inc_vat', 'min'),
+                  max_rate=('rate_inc_vat', 'max')))
+    has_import = 'import' in stats.index
+    has_export = 'export' in stats.index
+    
     # Import analysis
-    import_data = enhanced_df[enhanced_df['meter_type'] == 'import']
-    if not import_data.empty:
-        total_import_kwh = import_data['consumption'].sum()
-        total_import_cost = import_data['cost_inc_vat'].sum()
-        total_standing_charges = import_data['standing_charge'].sum()
+    if has_import:
+        import_stats = stats.loc['import']
+        total_import_kwh = import_stats['kwh']
+        total_import_cost = import_stats['cost']
+        total_standing_charges = import_stats['standing']
         avg_import_rate = (total_import_cost / total_import_kwh) if total_import_kwh > 0 else 0
         
         print(f"   🔴 Import:")
@@ -175,15 +273,13 @@ def process_consumption_with_real_pricing(consumption_file: str = 'octopus_consu
         print(f"      Average rate: {avg_import_rate:.2f}p/kWh")
         
         if import_tariff.is_variable:
-            min_rate = import_data['rate_inc_vat'].min()
-            max_rate = import_data['rate_inc_vat'].max()
-            print(f"      Rate range: {min_rate:.2f}p - {max_rate:.2f}p/kWh")
+            print(f"      Rate range: {import_stats['min_rate']:.2f}p - {import_stats['max_rate']:.2f}p/kWh")
     
     # Export analysis
-    export_data = enhanced_df[enhanced_df['meter_type'] == 'export']
-    if not export_data.empty:
-        total_export_kwh = export_data['consumption'].sum()
-        total_export_earnings = export_data['cost_inc_vat'].sum()
+    if has_export:
+        export_stats = stats.loc['export']
+        total_export_kwh = export_stats['kwh']
+        total_export_earnings = export_stats['cost']
         avg_export_rate = (total_export_earnings / total_export_kwh) if total_export_kwh > 0 else 0
         
         print(f"   🟢 Export:")
@@ -192,12 +288,10 @@ def process_consumption_with_real_pricing(consumption_file: str = 'octopus_consu
         print(f"      Average rate: {avg_export_rate:.2f}p/kWh")
         
         if export_tariff and export_tariff.is_variable:
-            min_rate = export_data['rate_inc_vat'].min()
-            max_rate = export_data['rate_inc_vat'].max()
-            print(f"      Rate range: {min_rate:.2f}p - {max_rate:.2f}p/kWh")
+            print(f"      Rate range: {export_stats['min_rate']:.2f}p - {export_stats['max_rate']:.2f}p/kWh")
     
     # Net cost
-    if not import_data.empty and not export_data.empty:
+    if has_import and has_export:
         total_bill = total_import_cost + total_standing_charges
         net_cost = total_bill - total_export_earnings
         savings_rate = (total_export_earnings / total_bill * 100) if total_bill > 0 else 0
@@ -213,12 +307,16 @@ def process_consumption_with_real_pricing(consumption_file: str = 'octopus_consu
     
     # Round pricing columns for readability
     price_columns = ['rate_inc_vat', 'rate_exc_vat', 'cost_inc_vat', 'cost_exc_vat', 'standing_charge']
-    for col in price_columns:
-        if col in enhanced_df.columns:
-            enhanced_df[col] = enhanced_df[col].round(4)
+    existing_columns = [col for col in price_columns if col in enhanced_df.columns]
+    # Python's round() per value, as before; numpy's round can differ in the last decimal
+    for col in existing_columns:
+        enhanced_df[col] = enhanced_df[col].astype(float).map(lambda v: round(v, 4))
     
     try:
-        enhanced_df.to_csv(output_file, index=False)
+        if output_format == 'parquet':
+            enhanced_df.to_parquet(output_file, index=False, compression='zstd')
+        else:
+            enhanced_df.to_csv(output_file, index=False)
         print(f"✅ Enhanced data saved with {len(enhanced_df)} records")
         
         # Show sample of enhanced data
@@ -250,30 +348,30 @@ def create_daily_summary_with_pricing(enhanced_file: str = 'octopus_consumption_
         return False
     
     try:
-        df = pd.read_csv(enhanced_file)
+        if enhanced_file.endswith('.parquet'):
+            df = pd.read_parquet(enhanced_file, columns=SUMMARY_COLUMNS)
+        else:
+            df = pd.read_csv(enhanced_file, usecols=SUMMARY_COLUMNS, dtype=CONSUMPTION_DTYPES)
         df['interval_start'] = pd.to_datetime(df['interval_start'], utc=True)
         
-        # Convert to local timezone for daily grouping
-        df['date_local'] = df['interval_start'].dt.tz_convert('Europe/London').dt.date
+        # Convert to local midnight for daily grouping, keeping a datetime64 key rather than date objects
+        df['date_local'] = df['interval_start'].dt.tz_convert('Europe/London').dt.tz_localize(None).dt.normalize()
         
-        # Group by date and meter type
-        daily_summary = df.groupby(['date_local', 'meter_type']).agg({
-            'consumption': ['sum', 'count'],
-            'cost_inc_vat': 'sum',
-            'cost_exc_vat': 'sum',
-            'standing_charge': 'sum',
-            'rate_inc_vat': ['min', 'max', 'mean']
-        }).round(4)
-        
-        # Flatten column names
-        daily_summary.columns = [
-            'total_kwh', 'readings_count',
-            'total_cost_inc_vat', 'total_cost_exc_vat', 'total_standing_charge',
-            'min_rate', 'max_rate', 'avg_rate'
-        ]
+        # Group by date and meter type (categorical meter type hashes as small integer codes)
+        daily_summary = df.groupby(['date_local', 'meter_type'], observed=True).agg(
+            total_kwh=('consumption', 'sum'),
+            readings_count=('consumption', 'count'),
+            total_cost_inc_vat=('cost_inc_vat', 'sum'),
+            total_cost_exc_vat=('cost_exc_vat', 'sum'),
+            total_standing_charge=('standing_charge', 'sum'),
+            min_rate=('rate_inc_vat', 'min'),
+            max_rate=('rate_inc_vat', 'max'),
+            avg_rate=('rate_inc_vat', 'mean')
+        ).round(4)
         
         daily_summary.reset_index(inplace=True)
         daily_summary.rename(columns={'date_local': 'date'}, inplace=True)
+        daily_summary['date'] = daily_summary['date'].dt.date
         
         # Save daily summary
         daily_summary.to_csv(daily_file, index=False)
@@ -293,12 +391,23 @@ def main():
                        help='Input consumption CSV file')
     parser.add_argument('--output', type=str, default='octopus_consumption_with_pricing.csv',
                        help='Output CSV file with pricing')
+    parser.add_argument('--format', choices=['csv', 'parquet'], default='csv',
+                       help='Output file format (parquet needs pyarrow)')
     parser.add_argument('--days', type=int, help='Limit to last N days (to reduce API calls)')
+    parser.add_argument('--no-pricing-cache', action='store_true',
+                       help=f'Always fetch pricing from the API instead of reusing {PRICING_CACHE_DIR}/')
     parser.add_argument('--daily-summary', action='store_true', 
                        help='Also create daily summary with pricing')
     
     args = parser.parse_args()
     
+    if args.format == 'parquet':
+        if not PARQUET_AVAILABLE:
+            print("❌ Parquet output needs pyarrow: pip install pyarrow")
+            return
+        if args.output.endswith('.csv'):
+            args.output = args.output[:-len('.csv')] + '.parquet'
+    
     # Check environment variables
     api_key = os.getenv('OCTOPUS_API_KEY')
     account_number = os.getenv('OCTOPUS_ACCOUNT_NUMBER')
@@ -314,7 +423,9 @@ def main():
     success = process_consumption_with_real_pricing(
         consumption_file=args.input,
         output_file=args.output,
-        date_limit_days=args.days
+        date_limit_days=args.days,
+        output_format=args.format,
+        use_pricing_cache=not args.no_pricing_cache
     )
     
     if not success:
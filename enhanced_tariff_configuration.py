@@ -5,12 +5,20 @@ Handles time-of-use pricing, day/night rates, and quarterly price changes
 """
 
 import json
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta, time
 from dataclasses import dataclass, asdict
 from typing import List, Dict, Optional, Tuple
 import os
 
+# Read and write the configuration with orjson when it is installed
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 
 @dataclass
 class TimeOfUseRate:
@@ -21,10 +29,15 @@ class TimeOfUseRate:
     end_time: str  # "HH:MM" format
     description: str = ""
 
+    def __post_init__(self):
+        # Parse once; plain attributes stay out of asdict() and the saved configuration
+        self._start = time.fromisoformat(self.start_time)
+        self._end = time.fromisoformat(self.end_time)
+
     def applies_to_time(self, check_time: time) -> bool:
         """Check if this rate applies to a given time"""
-        start = time.fromisoformat(self.start_time)
-        end = time.fromisoformat(self.end_time)
+        start = self._start
+        end = self._end
         
         # Handle overnight periods (e.g., 23:00 to 07:00)
         if start > end:
@@ -75,6 +88,44 @@ class EnhancedTariffPeriod:
         
         return self.fixed_rate or 0.0, "Fixed"
 
+    def get_rates_for_times(self, dt_index: pd.DatetimeIndex) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get the applicable rates for many datetimes at once (same rules as get_rate_for_time)
+        Returns (rates_inc_vat, rate_names) arrays aligned with dt_index
+        """
+        if not self.time_of_use_rates:
+            return (np.full(len(dt_index), self.fixed_rate or 0.0, dtype=float),
+                    np.full(len(dt_index), "Fixed", dtype=object))
+        
+        minutes = dt_index.hour.to_numpy() * 60 + dt_index.minute.to_numpy()
+        rate_idx = self._minute_rate_index()[minutes]
+        
+        rates = np.array([rate.rate_inc_vat for rate in self.time_of_use_rates], dtype=float)
+        names = np.array([rate.name for rate in self.time_of_use_rates], dtype=object)
+        return rates[rate_idx], names[rate_idx]
+    
+    def _minute_rate_index(self) -> np.ndarray:
+        """Index of the applicable time-of-use rate for each minute of the day"""
+        minutes = np.arange(24 * 60)
+        
+        # Fill in reverse so earlier rates win; unmatched minutes fall back to the first rate
+        rate_idx = np.zeros(len(minutes), dtype=np.intp)
+        for i in range(len(self.time_of_use_rates) - 1, -1, -1):
+            rate = self.time_of_use_rates[i]
+            start = rate._start
+            end = rate._end
+            start_min = start.hour * 60 + start.minute
+            end_min = end.hour * 60 + end.minute
+            
+            # Handle overnight periods (e.g., 23:00 to 07:00)
+            if start > end:
+                applies = (minutes >= start_min) | (minutes < end_min)
+            else:
+                applies = (minutes >= start_min) & (minutes < end_min)
+            rate_idx[applies] = i
+        
+        return rate_idx
+
     def get_start_datetime(self) -> datetime:
         """Convert start_date string to datetime"""
         return datetime.fromisoformat(self.start_date + 'T00:00:00+00:00')
@@ -92,26 +143,29 @@ class EnhancedTariffConfigurationManager:
     def __init__(self, config_file: str = 'enhanced_tariff_config.json'):
         self.config_file = config_file
         self.tariff_periods: List[EnhancedTariffPeriod] = []
+        self._bounds_signature = None
         self.load_configuration()
     
     def load_configuration(self):
         """Load enhanced tariff configuration from file"""
         if os.path.exists(self.config_file):
             try:
-                with open(self.config_file, 'r') as f:
-                    data = json.load(f)
+                if ORJSON_AVAILABLE:
+                    with open(self.config_file, 'rb') as f:
+                        data = orjson.loads(f.read())
+                else:
+                    with open(self.config_file, 'r') as f:
+                        data = json.load(f)
                 
-                self.tariff_periods = []
-                for period_data in data.get('tariff_periods', []):
-                    # Convert time_of_use_rates from dict to TimeOfUseRate objects
-                    tou_rates = []
-                    if 'time_of_use_rates' in period_data and period_data['time_of_use_rates']:
-                        for rate_data in period_data['time_of_use_rates']:
-                            tou_rates.append(TimeOfUseRate(**rate_data))
-                    
-                    period_data['time_of_use_rates'] = tou_rates
-                    period = EnhancedTariffPeriod(**period_data)
-                    self.tariff_periods.append(period)
+                # Convert time_of_use_rates from dicts to TimeOfUseRate objects while building each period
+                self.tariff_periods = [
+                    EnhancedTariffPeriod(**{
+                        **period_data,
+                        'time_of_use_rates': [TimeOfUseRate(**rate_data)
+                                              for rate_data in period_data.get('time_of_use_rates') or []]
+                    })
+                    for period_data in data.get('tariff_periods', [])
+                ]
                 
                 print(f"✅ Loaded {len(self.tariff_periods)} enhanced tariff periods from {self.config_file}")
                 
@@ -210,25 +264,19 @@ class EnhancedTariffConfigurationManager:
     def save_configuration(self):
         """Save current configuration to file"""
         try:
-            # Convert TimeOfUseRate objects to dicts for JSON serialization
-            periods_data = []
-            for period in self.tariff_periods:
-                period_dict = asdict(period)
-                # Convert TimeOfUseRate objects to dicts
-                if period_dict['time_of_use_rates']:
-                    period_dict['time_of_use_rates'] = [
-                        asdict(rate) for rate in period.time_of_use_rates
-                    ]
-                periods_data.append(period_dict)
-            
+            # asdict recurses, so nested TimeOfUseRate objects become dicts too
             data = {
-                'tariff_periods': periods_data,
+                'tariff_periods': [asdict(period) for period in self.tariff_periods],
                 'last_updated': datetime.now().isoformat(),
                 'format_version': '2.0_enhanced'
             }
             
-            with open(self.config_file, 'w') as f:
-                json.dump(data, f, indent=2)
+            if ORJSON_AVAILABLE:
+                with open(self.config_file, 'wb') as f:
+                    f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+            else:
+                with open(self.config_file, 'w') as f:
+                    json.dump(data, f, indent=2)
             
             print(f"💾 Enhanced configuration saved to {self.config_file}")
             
@@ -276,6 +324,40 @@ class EnhancedTariffConfigurationManager:
         
         return None
 
+    def get_tariffs_for_dates(self, dt_index: pd.DatetimeIndex, is_export: bool = False) -> np.ndarray:
+        """
+        Get the applicable tariff for many datetimes at once (same rules as get_tariff_for_date)
+        Returns indices into tariff_periods, -1 where no tariff applies
+        """
+        if dt_index.tz is None:
+            dt_index = dt_index.tz_localize('UTC')
+        times = dt_index.tz_convert('UTC').tz_localize(None).to_numpy(dtype='datetime64[ns]')
+        starts, ends, period_is_export = self._period_bounds()
+        
+        # Fill in reverse so the first listed period wins where periods overlap
+        indices = np.full(len(times), -1)
+        for i in np.flatnonzero(period_is_export == is_export)[::-1]:
+            in_period = times >= starts[i]
+            if not np.isnat(ends[i]):
+                in_period &= times <= ends[i]
+            indices[in_period] = i
+        
+        return indices
+    
+    def _period_bounds(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Start/end datetimes and direction of every period, rebuilt only when the periods change"""
+        signature = tuple((p.start_date, p.end_date, p.is_export) for p in self.tariff_periods)
+        if self._bounds_signature != signature:
+            # Ongoing periods (no end date) get NaT as their end
+            self._bounds = (
+                np.array([p.start_date + 'T00:00:00' for p in self.tariff_periods], dtype='datetime64[ns]'),
+                np.array([p.end_date + 'T23:59:59' if p.end_date else 'NaT' for p in self.tariff_periods],
+                         dtype='datetime64[ns]'),
+                np.array([p.is_export for p in self.tariff_periods], dtype=bool)
+            )
+            self._bounds_signature = signature
+        return self._bounds
+
     def create_bill_input_helper(self):
         """Interactive helper to input quarterly bill data"""
         print("\n🧾 Bill Data Input Helper")
@@ -290,6 +372,7 @@ class EnhancedTariffConfigurationManager:
         for i, period in enumerate(flexible_periods):
             print(f"{i+1}. {period.name} ({period.start_date} to {period.end_date})")
         
+        # Edits apply to the in-memory periods straight away; the file is written once at the end
         while True:
             try:
                 choice = input(f"\nEnter period number to update (1-{len(flexible_periods)}) or 'q' to quit: ").strip()
@@ -298,7 +381,8 @@ class EnhancedTariffConfigurationManager:
                 
                 period_idx = int(choice) - 1
                 if 0 <= period_idx < len(flexible_periods):
-                    self._update_period_from_bill(flexible_periods[period_idx])
+                    period = flexible_periods[period_idx]
+                    self._apply_bill_patch(period, self._update_period_from_bill(period))
                 else:
                     print("Invalid period number")
                     
@@ -308,30 +392,47 @@ class EnhancedTariffConfigurationManager:
         self.save_configuration()
         print("\n✅ Bill data updated!")
     
-    def _update_period_from_bill(self, period: EnhancedTariffPeriod):
-        """Update a period with actual bill data"""
+    def _update_period_from_bill(self, period: EnhancedTariffPeriod) -> Dict[str, float]:
+        """Ask for a period's bill data and return the values entered"""
         print(f"\n📄 Updating: {period.name}")
         print(f"📅 Period: {period.start_date} to {period.end_date}")
         
-        day_rate = input(f"Day rate (current: {period.time_of_use_rates[1].rate_inc_vat if len(period.time_of_use_rates) > 1 else 'N/A'}p/kWh): ")
-        night_rate = input(f"Night rate (current: {period.time_of_use_rates[0].rate_inc_vat if period.time_of_use_rates else 'N/A'}p/kWh): ")
+        rates = period.time_of_use_rates
+        current_day = rates[1].rate_inc_vat if len(rates) > 1 else 'N/A'
+        current_night = rates[0].rate_inc_vat if rates else 'N/A'
+        
+        day_rate = input(f"Day rate (current: {current_day}p/kWh): ")
+        night_rate = input(f"Night rate (current: {current_night}p/kWh): ")
         standing_charge = input(f"Standing charge (current: {period.standing_charge}p/day): ")
         
-        # Update rates
+        patch = {}
         if day_rate:
-            if len(period.time_of_use_rates) > 1:
-                period.time_of_use_rates[1].rate_inc_vat = float(day_rate)
+            patch['day_rate'] = float(day_rate)
+        if night_rate:
+            patch['night_rate'] = float(night_rate)
+        if standing_charge:
+            patch['standing_charge'] = float(standing_charge)
+        
+        return patch
+    
+    def _apply_bill_patch(self, period: EnhancedTariffPeriod, patch: Dict[str, float]):
+        """Apply the values entered by _update_period_from_bill to a period"""
+        rates = period.time_of_use_rates
+        
+        if 'day_rate' in patch:
+            if len(rates) > 1:
+                rates[1].rate_inc_vat = patch['day_rate']
             else:
-                period.time_of_use_rates.append(TimeOfUseRate("Day", float(day_rate), "07:00", "23:00", "Standard day rate"))
+                rates.append(TimeOfUseRate("Day", patch['day_rate'], "07:00", "23:00", "Standard day rate"))
         
-        if night_rate:
-            if period.time_of_use_rates:
-                period.time_of_use_rates[0].rate_inc_vat = float(night_rate)
+        if 'night_rate' in patch:
+            if rates:
+                rates[0].rate_inc_vat = patch['night_rate']
             else:
-                period.time_of_use_rates.append(TimeOfUseRate("Night", float(night_rate), "23:00", "07:00", "Cheap night rate"))
+                rates.append(TimeOfUseRate("Night", patch['night_rate'], "23:00", "07:00", "Cheap night rate"))
         
-        if standing_charge:
-            period.standing_charge = float(standing_charge)
+        if 'standing_charge' in patch:
+            period.standing_charge = patch['standing_charge']
         
         print(f"✅ Updated {period.name}")
 
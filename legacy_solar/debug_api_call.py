@@ -1,5 +1,6 @@
 import requests
-import json
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
 # Test the unified dashboard API directly
@@ -16,21 +17,24 @@ test_requests = [
     {"chart_type": "daily_overview", "options": []},  # No date filter - show all data
 ]
 
-for i, payload in enumerate(test_requests):
+# Send all test requests at once over one connection pool; results are printed in order below
+with requests.Session() as session, ThreadPoolExecutor(max_workers=len(test_requests)) as executor:
+    futures = [executor.submit(session.post, url, json=payload) for payload in test_requests]
+
+for i, (payload, future) in enumerate(zip(test_requests, futures)):
     print(f"\n=== TEST {i+1}: {payload} ===")
     
     try:
-        response = requests.post(url, json=payload)
+        response = future.result()
         print(f"Status Code: {response.status_code}")
         
         if response.status_code == 200:
             result = response.json()
             
             if result.get('success'):
-                # Parse the chart JSON
-                chart_json = result.get('chart')
-                if chart_json:
-                    chart_data = json.loads(chart_json)
+                # The chart is embedded in the response as a JSON object
+                chart_data = result.get('chart')
+                if chart_data:
                     traces = chart_data.get('data', [])
                     
                     print(f"Chart has {len(traces)} traces")
@@ -51,15 +55,15 @@ for i, payload in enumerate(test_requests):
                         
                         if len(y_values) > 1:
                             # Check for artificial patterns
-                            diffs = [y_values[i+1] - y_values[i] for i in range(min(10, len(y_values)-1))]
-                            print(f"    First 10 differences: {diffs}")
+                            diffs = np.diff(np.asarray(y_values, dtype=np.float64))
+                            print(f"    First 10 differences: {diffs[:10].tolist()}")
                             
                             # Check if monotonically increasing (cumulative)
-                            is_monotonic = all(y_values[i] <= y_values[i+1] for i in range(len(y_values)-1))
+                            is_monotonic = bool((diffs >= 0).all())
                             print(f"    Monotonically increasing: {is_monotonic}")
                             
                             # Check if all differences are around 1
-                            avg_diff = sum(diffs) / len(diffs) if diffs else 0
+                            avg_diff = diffs[:10].mean()
                             print(f"    Average difference: {avg_diff:.3f}")
                 else:
                     print("No chart data in response")
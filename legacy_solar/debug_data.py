@@ -16,15 +16,12 @@ print('Import data sample:')
 print(import_data[['date', 'total_kwh']])
 print()
 
-# Check if rolling averages cause cumulative effect
-df_copy = df.copy()
-df_copy = df_copy.sort_values('date')
+# Check if rolling averages cause cumulative effect (df is already sorted by date)
+df['rolling_avg'] = df.groupby('meter_type', sort=False)['total_kwh'].transform(
+    lambda s: s.rolling(window=7, center=True).mean()
+)
 
-for meter_type in df_copy['meter_type'].unique():
-    mask = df_copy['meter_type'] == meter_type
-    df_copy.loc[mask, 'rolling_avg'] = df_copy.loc[mask, 'total_kwh'].rolling(window=7, center=True).mean()
-
-import_with_rolling = df_copy[df_copy['meter_type'] == 'import'].head(10)
+import_with_rolling = df[df['meter_type'] == 'import'].head(10)
 print('Import data with rolling averages:')
 print(import_with_rolling[['date', 'total_kwh', 'rolling_avg']])
 print()
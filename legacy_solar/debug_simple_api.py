@@ -1,5 +1,5 @@
 import requests
-import json
+import numpy as np
 
 url = "http://localhost:5000/api/solar-chart"
 payload = {"chart_type": "daily_overview", "options": []}
@@ -13,8 +13,7 @@ try:
         print(f"Success: {result.get('success')}")
         
         if result.get('success'):
-            chart_json = result.get('chart')
-            chart_data = json.loads(chart_json)
+            chart_data = result.get('chart')
             traces = chart_data.get('data', [])
             
             print(f"Number of traces: {len(traces)}")
@@ -36,15 +35,15 @@ try:
                     
                     # Check for the artificial cumulative pattern
                     if len(y_data) > 10:
-                        diffs = [y_data[i+1] - y_data[i] for i in range(10)]
-                        print(f"First 10 differences: {[round(d, 3) for d in diffs]}")
+                        diffs = np.diff(np.asarray(y_data, dtype=np.float64))
+                        print(f"First 10 differences: {diffs[:10].round(3).tolist()}")
                         
                         # Check if monotonically increasing (cumulative)
-                        is_monotonic = all(y_data[i] <= y_data[i+1] for i in range(len(y_data)-1))
+                        is_monotonic = bool((diffs >= 0).all())
                         print(f"Monotonically increasing: {is_monotonic}")
                         
                         # Check average difference 
-                        avg_diff = sum(diffs) / len(diffs)
+                        avg_diff = diffs[:10].mean()
                         print(f"Average difference: {avg_diff:.3f}")
                 
                 if isinstance(x_data, dict):
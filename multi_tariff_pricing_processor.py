@@ -56,7 +56,8 @@ class MultiTariffPricingProcessor:
             return False
         
         try:
-            consumption_df = pd.read_csv(consumption_file)
+            # Categorical meter type makes the repeated import/export masks integer comparisons
+            consumption_df = pd.read_csv(consumption_file, dtype={'meter_type': 'category'})
             consumption_df['interval_start'] = pd.to_datetime(consumption_df['interval_start'], utc=True)
             consumption_df['interval_end'] = pd.to_datetime(consumption_df['interval_end'], utc=True)
             
@@ -239,6 +240,12 @@ class MultiTariffPricingProcessor:
                                include_standing_charge: bool = True):
         """Apply pricing data to consumption records for a specific period"""
         
+        # Standing charge only applies to import records, so work it out once up front
+        standing_charge = 0.0
+        if include_standing_charge and period.standing_charge:
+            # Distribute daily standing charge across 48 half-hourly periods
+            standing_charge = period.standing_charge / 48.0
+        
         for idx in enhanced_df[period_mask].index:
             interval_start = enhanced_df.at[idx, 'interval_start']
             consumption = enhanced_df.at[idx, 'consumption']
@@ -258,12 +265,6 @@ class MultiTariffPricingProcessor:
                 cost_inc_vat = consumption * rate_inc_vat
                 cost_exc_vat = consumption * rate_exc_vat
                 
-                # Add standing charge for import records
-                standing_charge = 0.0
-                if include_standing_charge and period.standing_charge:
-                    # Distribute daily standing charge across 48 half-hourly periods
-                    standing_charge = period.standing_charge / 48.0
-                
                 # Update the result DataFrame
                 enhanced_df.at[idx, 'tariff_name'] = period.name
                 enhanced_df.at[idx, 'tariff_code'] = period.tariff_code
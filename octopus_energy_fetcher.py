@@ -178,14 +178,15 @@ class DataAnalyzer:
         
         # Convert to local timezone (UK)
         df_local = df.copy()
-        df_local['date'] = df_local['interval_start'].dt.tz_convert('Europe/London').dt.date
-        
-        daily_summary = df_local.groupby(['date', 'meter_type']).agg({
-            'consumption': ['sum', 'mean', 'min', 'max', 'count']
-        }).round(3)
-        
-        # Flatten column names
-        daily_summary.columns = ['total_kwh', 'avg_kwh', 'min_kwh', 'max_kwh', 'readings_count']
+        df_local['date'] = df_local['interval_start'].dt.tz_convert('Europe/London').dt.tz_localize(None).values.astype('datetime64[D]')
+        
+        daily_summary = df_local.groupby(['date', 'meter_type']).agg(
+            total_kwh=('consumption', 'sum'),
+            avg_kwh=('consumption', 'mean'),
+            min_kwh=('consumption', 'min'),
+            max_kwh=('consumption', 'max'),
+            readings_count=('consumption', 'count')
+        ).round(3)
         daily_summary.reset_index(inplace=True)
         
         return daily_summary
@@ -208,12 +209,11 @@ class DataAnalyzer:
         df_local = df.copy()
         df_local['year_month'] = df_local['interval_start'].dt.tz_convert('Europe/London').dt.to_period('M')
         
-        monthly_summary = df_local.groupby(['year_month', 'meter_type']).agg({
-            'consumption': ['sum', 'mean', 'count']
-        }).round(3)
-        
-        # Flatten column names
-        monthly_summary.columns = ['total_kwh', 'avg_kwh', 'readings_count']
+        monthly_summary = df_local.groupby(['year_month', 'meter_type']).agg(
+            total_kwh=('consumption', 'sum'),
+            avg_kwh=('consumption', 'mean'),
+            readings_count=('consumption', 'count')
+        ).round(3)
         monthly_summary.reset_index(inplace=True)
         
         return monthly_summary
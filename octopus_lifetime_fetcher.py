@@ -196,53 +196,61 @@ class EnhancedDataAnalyzer:
         df_local = df.copy()
         
         # Ensure interval_start is datetime and handle timezone conversion safely
-        df_local['interval_start'] = pd.to_datetime(df_local['interval_start'], utc=True)
+        # (to_dataframe already parses it as UTC, so only convert other inputs)
+        if not isinstance(df_local['interval_start'].dtype, pd.DatetimeTZDtype):
+            df_local['interval_start'] = pd.to_datetime(df_local['interval_start'], utc=True)
         
         # Convert to UK timezone
         df_local['datetime_local'] = df_local['interval_start'].dt.tz_convert('Europe/London')
-        df_local['date'] = df_local['datetime_local'].dt.date
+        df_local['date'] = df_local['datetime_local'].dt.tz_localize(None).values.astype('datetime64[D]')
         df_local['year_month'] = df_local['datetime_local'].dt.to_period('M')
         df_local['year'] = df_local['datetime_local'].dt.year
         df_local['hour'] = df_local['datetime_local'].dt.hour
         df_local['day_of_week'] = df_local['datetime_local'].dt.day_name()
         
         # Daily summary
-        daily_summary = df_local.groupby(['date', 'meter_type']).agg({
-            'consumption': ['sum', 'mean', 'min', 'max', 'count']
-        }).round(3)
-        daily_summary.columns = ['total_kwh', 'avg_kwh', 'min_kwh', 'max_kwh', 'readings_count']
+        daily_summary = df_local.groupby(['date', 'meter_type']).agg(
+            total_kwh=('consumption', 'sum'),
+            avg_kwh=('consumption', 'mean'),
+            min_kwh=('consumption', 'min'),
+            max_kwh=('consumption', 'max'),
+            readings_count=('consumption', 'count')
+        ).round(3)
         daily_summary.reset_index(inplace=True)
         summaries['daily'] = daily_summary
         
         # Monthly summary
-        monthly_summary = df_local.groupby(['year_month', 'meter_type']).agg({
-            'consumption': ['sum', 'mean', 'count']
-        }).round(3)
-        monthly_summary.columns = ['total_kwh', 'avg_kwh', 'readings_count']
+        monthly_summary = df_local.groupby(['year_month', 'meter_type']).agg(
+            total_kwh=('consumption', 'sum'),
+            avg_kwh=('consumption', 'mean'),
+            readings_count=('consumption', 'count')
+        ).round(3)
         monthly_summary.reset_index(inplace=True)
         summaries['monthly'] = monthly_summary
         
         # Yearly summary
-        yearly_summary = df_local.groupby(['year', 'meter_type']).agg({
-            'consumption': ['sum', 'mean', 'count']
-        }).round(3)
-        yearly_summary.columns = ['total_kwh', 'avg_kwh', 'readings_count']
+        yearly_summary = df_local.groupby(['year', 'meter_type']).agg(
+            total_kwh=('consumption', 'sum'),
+            avg_kwh=('consumption', 'mean'),
+            readings_count=('consumption', 'count')
+        ).round(3)
         yearly_summary.reset_index(inplace=True)
         summaries['yearly'] = yearly_summary
         
         # Hourly patterns (average by hour across all days)
-        hourly_pattern = df_local.groupby(['hour', 'meter_type']).agg({
-            'consumption': ['mean', 'count']
-        }).round(3)
-        hourly_pattern.columns = ['avg_kwh', 'readings_count']
+        hourly_pattern = df_local.groupby(['hour', 'meter_type']).agg(
+            avg_kwh=('consumption', 'mean'),
+            readings_count=('consumption', 'count')
+        ).round(3)
         hourly_pattern.reset_index(inplace=True)
         summaries['hourly_pattern'] = hourly_pattern
         
         # Day of week patterns
-        dow_pattern = df_local.groupby(['day_of_week', 'meter_type']).agg({
-            'consumption': ['mean', 'sum', 'count']
-        }).round(3)
-        dow_pattern.columns = ['avg_kwh', 'total_kwh', 'readings_count']
+        dow_pattern = df_local.groupby(['day_of_week', 'meter_type']).agg(
+            avg_kwh=('consumption', 'mean'),
+            total_kwh=('consumption', 'sum'),
+            readings_count=('consumption', 'count')
+        ).round(3)
         dow_pattern.reset_index(inplace=True)
         summaries['day_of_week_pattern'] = dow_pattern
         
@@ -256,12 +264,15 @@ class EnhancedDataAnalyzer:
         
         # Simple approach without timezone conversion
         df_local = df.copy()
-        df_local['date'] = df_local['interval_start'].dt.date
-        
-        daily_summary = df_local.groupby(['date', 'meter_type']).agg({
-            'consumption': ['sum', 'mean', 'min', 'max', 'count']
-        }).round(3)
-        daily_summary.columns = ['total_kwh', 'avg_kwh', 'min_kwh', 'max_kwh', 'readings_count']
+        df_local['date'] = df_local['interval_start'].values.astype('datetime64[D]')
+        
+        daily_summary = df_local.groupby(['date', 'meter_type']).agg(
+            total_kwh=('consumption', 'sum'),
+            avg_kwh=('consumption', 'mean'),
+            min_kwh=('consumption', 'min'),
+            max_kwh=('consumption', 'max'),
+            readings_count=('consumption', 'count')
+        ).round(3)
         daily_summary.reset_index(inplace=True)
         
         return daily_summary
@@ -280,8 +291,12 @@ def parse_date(date_string: str) -> datetime:
     raise ValueError(f"Unable to parse date: {date_string}")
 
 
-def main():
-    """Main function with command line argument support"""
+def main(argv=None):
+    """Main function with command line argument support
+    
+    argv defaults to sys.argv; pass a list (e.g. ['--days', '30']) to run a
+    fetch in-process without spawning a new interpreter.
+    """
     parser = argparse.ArgumentParser(description='Fetch Octopus Energy consumption data with custom date ranges')
     parser.add_argument('--days', type=int, help='Number of days to fetch (from today backwards)')
     parser.add_argument('--start-date', type=str, help='Start date (YYYY-MM-DD format)')
@@ -290,7 +305,7 @@ def main():
     parser.add_argument('--chunk-days', type=int, default=90, help='Number of days per API request chunk (default: 90)')
     parser.add_argument('--delay', type=float, default=0.5, help='Delay between API calls in seconds (default: 0.5)')
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
     # Configuration
     API_KEY = os.getenv('OCTOPUS_API_KEY', 'your_api_key_here')
@@ -13,6 +13,10 @@ import os
 from dataclasses import dataclass
 import time
 
+# Retries for rate-limited (HTTP 429) requests, doubling the wait each time
+MAX_RETRIES = 4
+RETRY_BACKOFF_SECONDS = 1.0
+
 
 @dataclass
 class TariffInfo:
@@ -45,6 +49,22 @@ class OctopusPricingAPI:
         else:
             self.authenticated = False
     
+    def _get_with_retry(self, url: str, params: Optional[Dict] = None) -> requests.Response:
+        """GET a URL, backing off and retrying when the API rate-limits us"""
+        delay = RETRY_BACKOFF_SECONDS
+        for attempt in range(MAX_RETRIES + 1):
+            response = self.session.get(url, params=params)
+            if response.status_code != 429 or attempt == MAX_RETRIES:
+                return response
+            
+            # Honour Retry-After when the API sends it
+            retry_after = response.headers.get('Retry-After')
+            wait = float(retry_after) if retry_after and retry_after.isdigit() else delay
+            print(f"  ⏳ Rate limited, retrying in {wait:.1f}s")
+            time.sleep(wait)
+            delay *= 2
+        return response
+    
     def get_historical_pricing_data(self, tariff_code: str, start_date: datetime, end_date: datetime, 
                                   is_export: bool = False) -> pd.DataFrame:
         """
@@ -87,7 +107,7 @@ class OctopusPricingAPI:
             
             try:
                 print(f"  📅 Fetching rates for {current_date.date()} to {chunk_end.date()}")
-                response = self.session.get(url, params=params)
+                response = self._get_with_retry(url, params=params)
                 response.raise_for_status()
                 
                 data = response.json()
@@ -97,7 +117,7 @@ class OctopusPricingAPI:
                 # Handle pagination
                 next_url = data.get('next')
                 while next_url:
-                    response = self.session.get(next_url)
+                    response = self._get_with_retry(next_url)
                     response.raise_for_status()
                     data = response.json()
                     rates = data.get('results', [])
@@ -168,7 +188,9 @@ class OctopusPricingAPI:
             print("❌ Consumption data must have 'interval_start' column")
             return pd.DataFrame()
         
-        result_df['interval_start'] = pd.to_datetime(result_df['interval_start'], utc=True)
+        # Skip re-parsing when the column is already a UTC datetime
+        if not self._is_utc_datetime(result_df['interval_start']):
+            result_df['interval_start'] = pd.to_datetime(result_df['interval_start'], utc=True)
         
         # Initialize pricing columns
         result_df['rate_inc_vat'] = None
@@ -215,41 +237,58 @@ class OctopusPricingAPI:
         
         return result_df
     
+    @staticmethod
+    def _is_utc_datetime(series: pd.Series) -> bool:
+        """Check whether a series already holds timezone-aware UTC datetimes"""
+        return isinstance(series.dtype, pd.DatetimeTZDtype) and str(series.dtype.tz) == 'UTC'
+    
     def _match_pricing_for_meter_type(self, result_df: pd.DataFrame, pricing_df: pd.DataFrame, 
                                     mask: pd.Series, standing_charge_daily: float) -> pd.DataFrame:
         """Helper method to match pricing for a specific meter type"""
         
-        for idx in result_df[mask].index:
-            interval_start = result_df.at[idx, 'interval_start']
-            consumption = result_df.at[idx, 'consumption']
+        # A single pricing period (fixed-rate tariff) is a constant lookup, so broadcast it
+        if len(pricing_df) == 1:
+            period = pricing_df.iloc[0]
+            interval_starts = result_df['interval_start']
+            rows = mask & (interval_starts >= period['valid_from']) & (interval_starts < period['valid_to'])
+            consumption = result_df.loc[rows, 'consumption']
             
-            # Find matching pricing period
-            matching_rates = pricing_df[
-                (pricing_df['valid_from'] <= interval_start) & 
-                (pricing_df['valid_to'] > interval_start)
-            ]
-            
-            if not matching_rates.empty:
-                # Use the first matching rate (should only be one)
-                rate_inc_vat = matching_rates.iloc[0]['rate_inc_vat']
-                rate_exc_vat = matching_rates.iloc[0]['rate_exc_vat']
-                
-                # Calculate costs
-                cost_inc_vat = consumption * rate_inc_vat
-                cost_exc_vat = consumption * rate_exc_vat
-                
-                # Add standing charge for import records (once per day)
-                standing_charge = 0.0
-                if standing_charge_daily > 0:
-                    # Add standing charge proportionally (assuming 48 half-hours per day)
-                    standing_charge = standing_charge_daily / 48.0
-                
-                # Update the result DataFrame
-                result_df.at[idx, 'rate_inc_vat'] = rate_inc_vat
-                result_df.at[idx, 'rate_exc_vat'] = rate_exc_vat
-                result_df.at[idx, 'cost_inc_vat'] = cost_inc_vat
-                result_df.at[idx, 'cost_exc_vat'] = cost_exc_vat
-                result_df.at[idx, 'standing_charge'] = standing_charge
+            result_df.loc[rows, 'rate_inc_vat'] = period['rate_inc_vat']
+            result_df.loc[rows, 'rate_exc_vat'] = period['rate_exc_vat']
+            result_df.loc[rows, 'cost_inc_vat'] = consumption * period['rate_inc_vat']
+            result_df.loc[rows, 'cost_exc_vat'] = consumption * period['rate_exc_vat']
+            result_df.loc[rows, 'standing_charge'] = standing_charge_daily / 48.0 if standing_charge_daily > 0 else 0.0
+            return result_df
+        
+        # As-of join each interval onto the latest period starting at or before it
+        intervals = result_df.loc[mask, ['interval_start', 'consumption']]
+        intervals = intervals.reset_index()
+        if not intervals['interval_start'].is_monotonic_increasing:
+            intervals = intervals.sort_values('interval_start', kind='stable')
+        
+        # Pricing is usually handed over already sorted, so only pay for the sort when it is not
+        periods = pricing_df[['valid_from', 'valid_to', 'rate_inc_vat', 'rate_exc_vat']].dropna(subset=['valid_from'])
+        if not periods['valid_from'].is_monotonic_increasing:
+            periods = periods.sort_values('valid_from', kind='stable')
+        periods['valid_from'] = periods['valid_from'].astype(intervals['interval_start'].dtype)
+        
+        matched = pd.merge_asof(intervals, periods, left_on='interval_start',
+                                right_on='valid_from', direction='backward')
+        matched = matched[matched['interval_start'] < matched['valid_to']]
+        if matched.empty:
+            return result_df
+        
+        rows = matched[intervals.columns[0]].to_numpy()
+        rate_inc_vat = matched['rate_inc_vat'].to_numpy()
+        rate_exc_vat = matched['rate_exc_vat'].to_numpy()
+        consumption = matched['consumption'].to_numpy()
+        
+        result_df.loc[rows, 'rate_inc_vat'] = rate_inc_vat
+        result_df.loc[rows, 'rate_exc_vat'] = rate_exc_vat
+        result_df.loc[rows, 'cost_inc_vat'] = consumption * rate_inc_vat
+        result_df.loc[rows, 'cost_exc_vat'] = consumption * rate_exc_vat
+        # Add standing charge proportionally (assuming 48 half-hours per day)
+        result_df.loc[rows, 'standing_charge'] = standing_charge_daily / 48.0 if standing_charge_daily > 0 else 0.0
         
         return result_df
             
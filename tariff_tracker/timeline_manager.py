@@ -2,6 +2,7 @@
 Timeline manager for managing tariff periods and fetching rate data.
 """
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, date, timedelta
 from typing import List, Dict, Optional
 import os
@@ -10,6 +11,9 @@ from .models import TariffConfig, TariffPeriod, TariffTimeline, TariffType, Flow
 from .api_client import OctopusAPIClient
 from .logging_config import get_logger, get_structured_logger, TimingContext
 
+# Maximum number of periods fetched from the API at once during a refresh
+REFRESH_WORKERS = 4
+
 
 class TimelineManager:
     """Manages tariff timelines and rate data fetching."""
@@ -379,29 +383,27 @@ class TimelineManager:
         """
         self.logger.info("Starting refresh of all rates")
         
-        # Refresh import timeline
-        for period in self.config.import_timeline.periods:
-            if self._should_skip_refresh(period):
-                self.logger.info(f"Skipping refresh for {period.display_name} (has manual rates)")
-                continue
-                
-            try:
-                self.fetch_rates_for_period(period)
-                self.logger.info(f"Refreshed rates for import period: {period.display_name}")
-            except Exception as e:
-                self.logger.error(f"Failed to refresh rates for import period {period.display_name}: {e}")
-        
-        # Refresh export timeline
-        for period in self.config.export_timeline.periods:
-            if self._should_skip_refresh(period):
-                self.logger.info(f"Skipping refresh for {period.display_name} (has manual rates)")
-                continue
-                
-            try:
-                self.fetch_rates_for_period(period)
-                self.logger.info(f"Refreshed rates for export period: {period.display_name}")
-            except Exception as e:
-                self.logger.error(f"Failed to refresh rates for export period {period.display_name}: {e}")
+        periods_to_refresh = []
+        for flow, timeline in (('import', self.config.import_timeline), ('export', self.config.export_timeline)):
+            for period in timeline.periods:
+                if self._should_skip_refresh(period):
+                    self.logger.info(f"Skipping refresh for {period.display_name} (has manual rates)")
+                    continue
+                periods_to_refresh.append((flow, period))
+        
+        # Each period only updates its own rates, so the API calls can overlap
+        with ThreadPoolExecutor(max_workers=REFRESH_WORKERS) as executor:
+            futures = {
+                executor.submit(self.fetch_rates_for_period, period): (flow, period)
+                for flow, period in periods_to_refresh
+            }
+            for future in as_completed(futures):
+                flow, period = futures[future]
+                try:
+                    future.result()
+                    self.logger.info(f"Refreshed rates for {flow} period: {period.display_name}")
+                except Exception as e:
+                    self.logger.error(f"Failed to refresh rates for {flow} period {period.display_name}: {e}")
         
         self.save_config()
         self.logger.info("Completed refresh of all rates")
@@ -0,0 +1,47 @@
+"""
+Tests for tariff_tracker standing charge lookups.
+"""
+
+from datetime import date, datetime, timezone
+
+from tariff_tracker.models import FlowDirection, StandingCharge, TariffPeriod, TariffType
+
+
+def make_period(standing_charges):
+    return TariffPeriod(
+        start_date=date(2024, 1, 1),
+        end_date=None,
+        product_code="VAR-22-11-01",
+        tariff_code="E-1R-VAR-22-11-01-A",
+        display_name="Flexible Octopus",
+        tariff_type=TariffType.VARIABLE,
+        flow_direction=FlowDirection.IMPORT,
+        region="A",
+        standing_charges=standing_charges,
+    )
+
+
+def utc(year, month, day):
+    return datetime(year, month, day, tzinfo=timezone.utc)
+
+
+def test_open_ended_charge_covers_time_after_later_bounded_charge():
+    period = make_period([
+        StandingCharge(utc(2024, 1, 1), None, 40.0, 42.0),
+        StandingCharge(utc(2024, 3, 1), utc(2024, 4, 1), 45.0, 47.25),
+    ])
+
+    charge = period.get_standing_charge_at_time(utc(2024, 5, 1))
+
+    assert charge is not None
+    assert charge.value_inc_vat == 42.0
+
+
+def test_lookup_sees_in_place_edits():
+    charge = StandingCharge(utc(2024, 1, 1), utc(2024, 4, 1), 40.0, 42.0)
+    period = make_period([charge])
+    assert period.get_standing_charge_at_time(utc(2024, 5, 1)) is None
+
+    charge.valid_to = None
+
+    assert period.get_standing_charge_at_time(utc(2024, 5, 1)) is charge
@@ -57,7 +57,8 @@ class UltimatePricingProcessor:
             return False
         
         try:
-            consumption_df = pd.read_csv(consumption_file)
+            # Categorical meter type makes the import/export splits below integer comparisons
+            consumption_df = pd.read_csv(consumption_file, dtype={'meter_type': 'category'})
             consumption_df['interval_start'] = pd.to_datetime(consumption_df['interval_start'], utc=True)
             consumption_df['interval_end'] = pd.to_datetime(consumption_df['interval_end'], utc=True)
             
@@ -90,64 +91,59 @@ class UltimatePricingProcessor:
         
         # Initialize result DataFrame
         enhanced_df = consumption_df.copy()
-        enhanced_df['tariff_name'] = ""
-        enhanced_df['tariff_code'] = ""
-        enhanced_df['rate_type'] = ""  # Day/Night/Variable
-        enhanced_df['rate_inc_vat'] = None
-        enhanced_df['rate_exc_vat'] = None
-        enhanced_df['cost_exc_vat'] = None
-        enhanced_df['cost_inc_vat'] = None
-        enhanced_df['standing_charge'] = 0.0
         
-        # Process each record individually for maximum accuracy
         print(f"\n🔄 Processing {len(enhanced_df)} consumption records...")
         
-        processed = 0
-        for idx, row in enhanced_df.iterrows():
-            interval_start = row['interval_start']
-            consumption = row['consumption']
-            meter_type = row['meter_type']
-            is_export = (meter_type == 'export')
-            
-            # Find applicable tariff period
-            tariff_period = self.config_manager.get_tariff_for_date(interval_start, is_export)
-            
-            if not tariff_period:
-                print(f"⚠️  No tariff found for {interval_start} ({meter_type})")
-                continue
+        # Find the applicable tariff period for every record in one pass per meter direction
+        interval_starts = pd.DatetimeIndex(enhanced_df['interval_start'])
+        is_export = (enhanced_df['meter_type'] == 'export').to_numpy()
+        period_idx = np.where(is_export,
+                              self.config_manager.get_tariffs_for_dates(interval_starts, is_export=True),
+                              self.config_manager.get_tariffs_for_dates(interval_starts, is_export=False))
+        
+        for row in np.flatnonzero(period_idx < 0):
+            print(f"⚠️  No tariff found for {interval_starts[row]} ({enhanced_df['meter_type'].iat[row]})")
+        
+        n = len(enhanced_df)
+        tariff_names = np.full(n, "", dtype=object)
+        tariff_codes = np.full(n, "", dtype=object)
+        rate_types = np.full(n, "", dtype=object)  # Day/Night/Variable
+        rates_inc_vat = np.full(n, np.nan)
+        standing_charges = np.zeros(n)
+        
+        # Price each tariff period's records together
+        for i in np.unique(period_idx[period_idx >= 0]):
+            tariff_period = self.config_manager.tariff_periods[i]
+            rows = np.flatnonzero(period_idx == i)
             
-            # Get rate for this specific time
             if tariff_period.is_variable and self.api.authenticated:
                 # Fetch variable rate (Agile)
-                rate_inc_vat, rate_type = self._get_agile_rate(tariff_period, interval_start)
+                for row in rows:
+                    rates_inc_vat[row], rate_types[row] = self._get_agile_rate(tariff_period, interval_starts[row])
             else:
                 # Use time-of-use or fixed rate
-                rate_inc_vat, rate_type = tariff_period.get_rate_for_time(interval_start)
-            
-            rate_exc_vat = rate_inc_vat / 1.05
-            cost_inc_vat = consumption * rate_inc_vat
-            cost_exc_vat = consumption * rate_exc_vat
-            
-            # Calculate standing charge
-            standing_charge = 0.0
-            if not is_export and tariff_period.standing_charge:
-                # Distribute daily standing charge across 48 half-hourly periods
-                standing_charge = tariff_period.standing_charge / 48.0
+                rates_inc_vat[rows], rate_types[rows] = tariff_period.get_rates_for_times(interval_starts[rows])
             
-            # Update the result DataFrame
-            enhanced_df.at[idx, 'tariff_name'] = tariff_period.name
-            enhanced_df.at[idx, 'tariff_code'] = tariff_period.tariff_code
-            enhanced_df.at[idx, 'rate_type'] = rate_type
-            enhanced_df.at[idx, 'rate_inc_vat'] = rate_inc_vat
-            enhanced_df.at[idx, 'rate_exc_vat'] = rate_exc_vat
-            enhanced_df.at[idx, 'cost_inc_vat'] = cost_inc_vat
-            enhanced_df.at[idx, 'cost_exc_vat'] = cost_exc_vat
-            enhanced_df.at[idx, 'standing_charge'] = standing_charge
+            tariff_names[rows] = tariff_period.name
+            tariff_codes[rows] = tariff_period.tariff_code
             
-            processed += 1
-            if processed % 1000 == 0:
-                print(f"   📊 Processed {processed}/{len(enhanced_df)} records...")
+            # Distribute daily standing charge across 48 half-hourly periods (import only)
+            if not tariff_period.is_export and tariff_period.standing_charge:
+                standing_charges[rows] = tariff_period.standing_charge / 48.0
         
+        consumption = enhanced_df['consumption'].to_numpy(dtype=float)
+        rates_exc_vat = rates_inc_vat / 1.05
+        
+        enhanced_df['tariff_name'] = tariff_names
+        enhanced_df['tariff_code'] = tariff_codes
+        enhanced_df['rate_type'] = rate_types
+        enhanced_df['rate_inc_vat'] = rates_inc_vat
+        enhanced_df['rate_exc_vat'] = rates_exc_vat
+        enhanced_df['cost_exc_vat'] = consumption * rates_exc_vat
+        enhanced_df['cost_inc_vat'] = consumption * rates_inc_vat
+        enhanced_df['standing_charge'] = standing_charges
+        
+        processed = int((period_idx >= 0).sum())
         print(f"✅ Processed {processed} records")
         
         # Calculate and display summary statistics
@@ -158,9 +154,10 @@ class UltimatePricingProcessor:
         
         # Round pricing columns for readability
         price_columns = ['rate_inc_vat', 'rate_exc_vat', 'cost_inc_vat', 'cost_exc_vat', 'standing_charge']
-        for col in price_columns:
-            if col in enhanced_df.columns:
-                enhanced_df[col] = enhanced_df[col].round(4)
+        existing_columns = [col for col in price_columns if col in enhanced_df.columns]
+        # Python's round() per value, as before; numpy's round can differ in the last decimal
+        for col in existing_columns:
+            enhanced_df[col] = enhanced_df[col].astype(float).map(lambda v: round(v, 4))
         
         try:
             enhanced_df.to_csv(output_file, index=False)
@@ -217,8 +214,9 @@ class UltimatePricingProcessor:
         print("=" * 80)
         
         # Overall summary
-        total_import_cost = enhanced_df[enhanced_df['meter_type'] == 'import']['cost_inc_vat'].sum()
-        total_standing_charges = enhanced_df[enhanced_df['meter_type'] == 'import']['standing_charge'].sum()
+        import_df = enhanced_df[enhanced_df['meter_type'] == 'import']
+        total_import_cost = import_df['cost_inc_vat'].sum()
+        total_standing_charges = import_df['standing_charge'].sum()
         total_export_earnings = enhanced_df[enhanced_df['meter_type'] == 'export']['cost_inc_vat'].sum()
         
         if total_import_cost > 0:
@@ -236,27 +234,23 @@ class UltimatePricingProcessor:
         
         # Rate type breakdown
         print(f"\n⚡ Rate Type Analysis:")
-        rate_analysis = enhanced_df[enhanced_df['meter_type'] == 'import'].groupby('rate_type').agg({
-            'consumption': 'sum',
-            'cost_inc_vat': 'sum',
-            'rate_inc_vat': ['min', 'max', 'mean']
-        }).round(2)
+        rate_analysis = import_df.groupby('rate_type').agg(
+            consumption=('consumption', 'sum'),
+            cost=('cost_inc_vat', 'sum'),
+            min_rate=('rate_inc_vat', 'min'),
+            max_rate=('rate_inc_vat', 'max'),
+            avg_rate=('rate_inc_vat', 'mean')
+        ).round(2)
         
-        for rate_type in rate_analysis.index:
-            consumption = rate_analysis.loc[rate_type, ('consumption', 'sum')]
-            cost = rate_analysis.loc[rate_type, ('cost_inc_vat', 'sum')]
-            min_rate = rate_analysis.loc[rate_type, ('rate_inc_vat', 'min')]
-            max_rate = rate_analysis.loc[rate_type, ('rate_inc_vat', 'max')]
-            avg_rate = rate_analysis.loc[rate_type, ('rate_inc_vat', 'mean')]
-            
-            print(f"   🔸 {rate_type}:")
-            print(f"      Energy: {consumption:.2f} kWh")
-            print(f"      Cost: £{cost/100:.2f}")
-            print(f"      Rate range: {min_rate:.2f}p - {max_rate:.2f}p/kWh (avg: {avg_rate:.2f}p)")
+        for rate in rate_analysis.itertuples():
+            print(f"   🔸 {rate.Index}:")
+            print(f"      Energy: {rate.consumption:.2f} kWh")
+            print(f"      Cost: £{rate.cost/100:.2f}")
+            print(f"      Rate range: {rate.min_rate:.2f}p - {rate.max_rate:.2f}p/kWh (avg: {rate.avg_rate:.2f}p)")
         
         # Tariff period breakdown
         print(f"\n📅 Tariff Period Analysis:")
-        period_analysis = enhanced_df[enhanced_df['meter_type'] == 'import'].groupby('tariff_name').agg({
+        period_analysis = import_df.groupby('tariff_name').agg({
             'consumption': 'sum',
             'cost_inc_vat': 'sum',
             'standing_charge': 'sum'